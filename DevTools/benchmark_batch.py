@@ -0,0 +1,50 @@
+"""
+Throughput benchmark for batchEngine.BatchEngine.
+
+Steps N boards with random actions, restarting boards as they top out,
+and reports board-steps per second.
+
+    python DevTools/benchmark_batch.py --boards 4096 --steps 500
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from batchEngine import BatchEngine, ACTION_COUNT
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--boards", type=int, default=4096)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    engine = BatchEngine(args.boards, seed=args.seed)
+    rng = np.random.default_rng(args.seed)
+    actions = rng.integers(0, ACTION_COUNT, size=(args.steps, args.boards))
+
+    lines = 0
+    games = 0
+    start = time.perf_counter()
+    for step_actions in actions:
+        lines += int(engine.step(step_actions).sum())
+        over = np.flatnonzero(engine.game_over)
+        if len(over):
+            games += len(over)
+            engine.reset(over)
+    elapsed = time.perf_counter() - start
+
+    board_steps = args.boards * args.steps
+    print(f"{args.boards} boards x {args.steps} steps in {elapsed:.2f} s")
+    print(f"{board_steps / elapsed:,.0f} board-steps/s")
+    print(f"{games} games finished, {lines} lines cleared")
+
+
+if __name__ == "__main__":
+    main()
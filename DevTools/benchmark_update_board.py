@@ -0,0 +1,79 @@
+"""
+Benchmark of the board sprite sync in GameView.update_board.
+
+Plays seeded games with random moves and, after every lock, syncs two sets of
+board sprites: one recolored in full like update_board used to do, one
+through helpers.sync_board_sprites which only recolors the changed cells.
+Reports the time per sync and checks both sets show the same board.
+
+    python DevTools/benchmark_update_board.py --pieces 2000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import arcade
+
+from constants import *
+from engine import TetrisEngine
+from blocks import block_colors, block_sprite
+from helpers import sync_board_sprites
+
+
+def make_sprites(board):
+    sprite_list = arcade.SpriteList(lazy=True)  # no window needed
+    for _ in range(len(board.cells)):
+        sprite_list.append(block_sprite())
+    return sprite_list
+
+
+def full_refresh(sprite_list, board):
+    """The old update_board: every sprite, every time."""
+    for i, cell_value in enumerate(board.cells):
+        sprite_list[i].color = block_colors[cell_value]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pieces", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    engine = TetrisEngine(seed=args.seed)
+    engine.start()
+    full_sprites = make_sprites(engine.board)
+    dirty_sprites = make_sprites(engine.board)
+
+    timings = {"full": 0.0, "dirty": 0.0}
+    syncs = 0
+    for _ in range(args.pieces):
+        if engine.game_over:
+            engine.start()
+        engine.rotate(rng.randrange(4))
+        engine.move(rng.randrange(-COLUMN_COUNT, COLUMN_COUNT))
+        engine.hard_drop()
+
+        start = time.perf_counter()
+        full_refresh(full_sprites, engine.board)
+        timings["full"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        sync_board_sprites(dirty_sprites, engine.board)
+        timings["dirty"] += time.perf_counter() - start
+        syncs += 1
+
+    for full, dirty in zip(full_sprites, dirty_sprites):
+        assert full.color == dirty.color, "dirty sync drifted from the board"
+
+    for name, seconds in timings.items():
+        print(f"{name:>5}: {seconds / syncs * 1e6:8.1f} us per sync")
+    print(f"{timings['full'] / timings['dirty']:.1f}x faster over {syncs} locks")
+
+
+if __name__ == "__main__":
+    main()
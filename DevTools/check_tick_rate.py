@@ -0,0 +1,64 @@
+"""
+Check of the logic tick rate of the views.
+
+Shows a view counting its on_logic_tick calls in a hidden window and drives
+the window's update dispatch (the same one arcade.run uses) at several frame
+rates. Every rate has to give LOGIC_TICK_RATE ticks per second, and an IDLE
+view none at all.
+
+    python DevTools/check_tick_rate.py --seconds 3
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import arcade
+
+from constants import *
+from ViewWithGamepadSupport import ViewWithGamepadSupport, ACTIVE, IDLE
+
+
+class TickCounter(ViewWithGamepadSupport):
+    def __init__(self, activity):
+        super().__init__()
+        self.activity = activity
+        self.ticks = 0
+
+    def on_logic_tick(self, delta_time):
+        self.ticks += 1
+
+
+def run(window, activity, fps, seconds):
+    """Logic ticks per second of a view shown for `seconds` at `fps` frames per second."""
+    view = TickCounter(activity)
+    window.show_view(view)
+    for _ in range(round(fps * seconds)):
+        window._dispatch_updates(1 / fps)
+        window.dispatch_events()  # queued while no event loop runs
+    return view.ticks / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--rates", type=int, nargs="+", default=[30, 60, 144])
+    args = parser.parse_args()
+
+    window = arcade.Window(WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_TITLE, visible=False)
+    failed = False
+    for fps in args.rates:
+        rate = run(window, ACTIVE, fps, args.seconds)
+        ok = abs(rate - LOGIC_TICK_RATE) <= 1 / args.seconds
+        failed |= not ok
+        print(f"{fps:>4} fps: {rate:6.1f} ticks per second {'ok' if ok else f'FAIL, expected {LOGIC_TICK_RATE}'}")
+
+    rate = run(window, IDLE, ACTIVE_RATE, args.seconds)
+    failed |= rate != 0
+    print(f"idle view: {rate:6.1f} ticks per second {'ok' if rate == 0 else 'FAIL, expected 0'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
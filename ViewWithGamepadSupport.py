@@ -3,9 +3,20 @@ from pyglet.math import Vec2
 from pyglet.event import EventDispatcher
 import math
 
+import crt
+import startup
+from constants import *
+from scheduler import FixedTimestep
+
 DEAD_ZONE = 0.2
 TRIGGER_THRESHOLD = 0.6
 
+# activity levels of a view, see ViewWithGamepadSupport.apply_activity
+ACTIVE = "active"  # something moves, the window runs at ACTIVE_RATE
+IDLE = "idle"  # waiting for input, the window runs at IDLE_RATE
+
+_manager = None  # one ControllerManager for all views, see attach_controllers
+
 
 class ViewWithGamepadSupport(arcade.View, EventDispatcher):
     """
@@ -13,20 +24,13 @@ class ViewWithGamepadSupport(arcade.View, EventDispatcher):
     Inherit this for any game view that needs controller input.
     """
 
+    activity = ACTIVE  # views with nothing moving say IDLE
+
     def __init__(self, window: arcade.Window = None):
         super().__init__(window)
 
         # ---------------- Controller Setup ----------------
-        self.manager = arcade.ControllerManager()
-        self.manager.push_handlers(self)
-
-        self.active = None
-        controllers = arcade.get_controllers()
-        if controllers:
-            self._use_controller(controllers[0])
-            print(f"[INFO] Connected to controller: {controllers[0].name}")
-        else:
-            print("[INFO] No controllers detected.")
+        self.active = None  # attached while the view is shown, see attach_controllers
 
         # ---------------- Input State ----------------
         self.left_x = self.left_y = 0.0
@@ -58,9 +62,123 @@ class ViewWithGamepadSupport(arcade.View, EventDispatcher):
         for d in ("up", "down", "left", "right", "centered"):
             self.register_event_type(f"on_dpad_{d}")
 
+        # ---------------- Fixed Timestep ----------------
+        self.timestep = FixedTimestep()
+
+        # ---------------- CRT Filter ----------------
+        self.filter_on = CRT_FILTER_ON
+        self.crt_preset = crt.GAME  # filter settings, see crt.py
+        self.scene_changed = True  # set when anything on screen changed, see on_draw
+
+    # ==========================================================
+    # Game Logic Ticks
+    # ==========================================================
+    def on_update(self, delta_time):
+        """Run on_logic_tick as many times as the fixed timestep asks for."""
+        if self.activity == IDLE:  # nothing to tick
+            return
+        for _ in range(self.timestep.advance(delta_time)):
+            self.on_logic_tick(self.timestep.step)
+
+    def on_logic_tick(self, delta_time):
+        """
+        Game logic, called LOGIC_TICK_RATE times per second whatever the frame rate.
+        Not on_fixed_update: arcade dispatches that event to the shown view on its own.
+        """
+        pass
+
+    # ==========================================================
+    # Activity
+    # ==========================================================
+    def on_show_view(self):
+        self.attach_controllers()
+        self.apply_activity()
+
+    def on_hide_view(self):
+        self.detach_controllers()
+
+    def apply_activity(self):
+        """
+        Run the window at the rate the view's activity needs. Call it again
+        whenever the activity changes, e.g. on pause and resume.
+        """
+        if self.activity == IDLE:
+            rate = IDLE_RATE
+        else:
+            rate = ACTIVE_RATE
+            self.timestep.reset()  # don't catch up on the idle time
+        # the update rate goes first, the draw rate may not be faster than it
+        self.window.set_update_rate(1 / rate)
+        self.window.set_draw_rate(1 / rate)
+        crt.governor.set_target_fps(rate)  # budget of the new rate, forgets the old frame times
+
+    # ==========================================================
+    # Rendering
+    # ==========================================================
+    def on_draw(self):
+        """
+        Render the view through the CRT filter, in the quality the governor
+        picks. While the scene did not change, the last filtered frame is
+        shown again instead.
+        """
+        size = self.window.get_framebuffer_size()
+        if self.filter_on and not self.scene_changed and crt.frame_cache.holds(self, size):
+            crt.governor.skip_frame()
+            crt.frame_cache.present()
+            self.window.use()
+            return
+
+        crt_filter = crt.governor.begin_frame(self.crt_preset) if self.filter_on else None
+        if crt_filter is None:
+            crt.frame_cache.invalidate()
+            self.clear()
+            self.draw()
+        else:
+            crt_filter.use()
+            crt_filter.clear()
+            self.draw()
+
+            frame = crt.frame_cache.target(self, size)
+            frame.use()
+            frame.clear(color=self.window.background_color)
+            crt.governor.draw_filter(crt_filter)
+            crt.frame_cache.present()
+            self.window.use()
+            self.scene_changed = False
+        crt.governor.end_frame()
+        startup.timer.first_frame()
+
+    def on_resize(self, width, height):
+        self.scene_changed = True
+
+    def draw(self):
+        """Draw the content of the view, on_draw takes care of the CRT filter."""
+        pass
+
     # ==========================================================
     # Controller Lifecycle
     # ==========================================================
+    def attach_controllers(self):
+        """Take the controller events, only the shown view gets them."""
+        global _manager
+        if _manager is None:
+            _manager = arcade.ControllerManager()
+        _manager.push_handlers(self)
+
+        controllers = arcade.get_controllers()
+        if controllers:
+            self._use_controller(controllers[0])
+            print(f"[INFO] Connected to controller: {controllers[0].name}")
+        else:
+            print("[INFO] No controllers detected.")
+
+    def detach_controllers(self):
+        _manager.remove_handlers(self)
+        if self.active:
+            self.active.remove_handlers(self)
+            self.active.close()
+            self.active = None
+
     def _use_controller(self, ctrl):
         self.active = ctrl
         ctrl.open()
@@ -211,7 +329,5 @@ class ViewWithGamepadSupport(arcade.View, EventDispatcher):
     # ==========================================================
     def on_close(self):
         """Clean up Controller after closing the window."""
-        if self.active:
-            self.active.remove_handlers(self)
-            self.active.close()
+        self.detach_controllers()
 
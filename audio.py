@@ -0,0 +1,235 @@
+"""
+Process wide sound registry.
+
+Every sound file is loaded exactly once per process, on a background thread,
+so views get ready to play arcade.Sound objects instead of decoding MP3s on
+the main thread every time they are built. Call ``sounds.preload()`` early at
+startup; a view asking for a sound that is still loading waits for just that
+one, and a sound nobody preloaded is loaded on the spot.
+
+Decoded audio is kept on disk in SOUND_CACHE_DIR as WAV files named after
+the source file, its hash and its mtime, so a sound file is decoded from MP3
+only the first time it is seen (or after it changed). Later launches use the
+cached PCM as it is: short effects are read into memory in one go, tracks
+longer than STREAM_SECONDS are streamed from the cached file.
+
+The registry keeps load metrics: how long each file took to load and how
+long the main thread had to wait for it. ``sounds.report()`` prints them.
+"""
+import glob
+import hashlib
+import os
+import re
+import struct
+import threading
+import time
+import wave
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import arcade
+import pyglet
+import pyglet.util
+
+SOUND_DIR = "sounds"
+SOUND_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "tetris", "sounds")
+# what reading a truncated or otherwise broken cached WAV raises
+CORRUPT_CACHE_ERRORS = (ValueError, struct.error, wave.Error, pyglet.util.DecodeException)
+STREAM_SECONDS = 20.0  # cached tracks longer than this are streamed, not read into memory
+
+
+class DecodedSource(pyglet.media.StaticSource):
+    """A StaticSource over PCM samples that are already decoded, nothing to read from a decoder."""
+
+    def __init__(self, data, audio_format):
+        self._data = data  # what StaticSource hands every player, see get_queue_source
+        self.audio_format = audio_format
+        self._duration = len(data) / audio_format.bytes_per_second
+
+
+class CachedSound(arcade.Sound):
+    """An arcade.Sound around an already decoded source, no file to load."""
+
+    def __init__(self, file_name, source):
+        self.file_name = file_name
+        self.source = source
+        self.min_distance = 100000000  # like arcade.Sound, no 3D attenuation
+
+
+def cache_path(path, cache_dir=SOUND_CACHE_DIR):
+    """Where the decoded copy of `path` lives, named after its hash and mtime."""
+    with open(path, "rb") as file:
+        digest = hashlib.sha1(file.read()).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f"{stem}-{digest}-{os.stat(path).st_mtime_ns}.wav")
+
+
+def decode_to_cache(path, cached):
+    """Decode `path` once and store its PCM as a WAV file at `cached`."""
+    source = pyglet.media.load(path, streaming=True).get_queue_source()
+    audio_format = source.audio_format
+    os.makedirs(os.path.dirname(cached), exist_ok=True)
+    partial = f"{cached}.{os.getpid()}.part"
+    try:
+        with wave.open(partial, "wb") as out:
+            out.setnchannels(audio_format.channels)
+            out.setsampwidth(audio_format.sample_size // 8)
+            out.setframerate(audio_format.sample_rate)
+            while (chunk := source.get_audio_data(1 << 16)) is not None:
+                out.writeframes(chunk.data)
+        os.replace(partial, cached)
+    finally:
+        if os.path.exists(partial):  # decoding or writing failed halfway
+            os.remove(partial)
+
+    # decoded copies of older versions of the file
+    stem = os.path.splitext(os.path.basename(path))[0]
+    older = re.compile(re.escape(stem) + r"-[0-9a-f]{16}-\d+\.wav")
+    for stale in glob.glob(os.path.join(os.path.dirname(cached), glob.escape(stem) + "-*.wav")):
+        if stale != cached and older.fullmatch(os.path.basename(stale)):
+            os.remove(stale)
+
+
+def _wav_layout(file):
+    """The AudioFormat of the PCM WAV `file` and the offset and size of its samples."""
+    file_size = os.fstat(file.fileno()).st_size
+    header = file.read(12)
+    if header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        raise ValueError("not a WAV file")
+    audio_format = None
+    offset = 12
+    while offset + 8 <= file_size:
+        file.seek(offset)
+        chunk_id, size = struct.unpack("<4sI", file.read(8))
+        offset += 8
+        if chunk_id == b"fmt ":
+            fmt = file.read(16)
+            channels, sample_rate = struct.unpack_from("<HI", fmt, 2)
+            (bits,) = struct.unpack_from("<H", fmt, 14)
+            audio_format = pyglet.media.codecs.AudioFormat(channels, bits, sample_rate)
+            if not audio_format.bytes_per_second:
+                raise ValueError("WAV file without a sample format")
+        elif chunk_id == b"data" and audio_format is not None:
+            return audio_format, offset, min(size, file_size - offset)
+        offset += size + (size & 1)
+    raise ValueError("WAV file without samples")
+
+
+def load_cached(cached, file_name):
+    """An arcade.Sound for the decoded WAV at `cached`: read into memory, or streamed if long."""
+    with open(cached, "rb") as file:
+        audio_format, offset, size = _wav_layout(file)
+        if size / audio_format.bytes_per_second > STREAM_SECONDS:
+            return arcade.Sound(cached, streaming=True)
+        file.seek(offset)
+        source = DecodedSource(file.read(size), audio_format)
+    return CachedSound(file_name, source)
+
+
+def load_sound(path, cache_dir=SOUND_CACHE_DIR):
+    """
+    Load a sound through the decoded cache, decoding it only on a cache miss.
+    Returns the sound and whether the cache had it. A broken cached copy is
+    deleted and decoded again; without a usable cache directory it falls
+    back to arcade.load_sound.
+    """
+    try:
+        cached = cache_path(path, cache_dir)
+        if os.path.exists(cached):
+            try:
+                return load_cached(cached, path), True
+            except CORRUPT_CACHE_ERRORS as error:
+                print(f"[INFO] Decoding {path} again, its cached copy is broken: {error}")
+                os.remove(cached)
+        decode_to_cache(path, cached)
+        return load_cached(cached, path), False
+    except OSError as error:
+        print(f"[INFO] Sound cache unavailable for {path}: {error}")
+        return arcade.load_sound(path), False
+
+
+class SoundRegistry:
+    """Loads each sound once, in the background, and hands out the loaded sounds."""
+
+    def __init__(self, sound_dir=SOUND_DIR, cache_dir=SOUND_CACHE_DIR):
+        self.sound_dir = sound_dir
+        self.cache_dir = cache_dir
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sound-loader")
+        self._lock = threading.Lock()
+        self._loads = {}  # path -> Future of the arcade.Sound
+
+        # metrics
+        self.load_times = {}  # path -> seconds spent loading it, on whichever thread
+        self.wait_times = {}  # path -> seconds the main thread waited for it
+        self.hits = 0  # get() calls that found the sound loaded already
+        self.decoded = []  # paths that missed the disk cache and were decoded
+
+    def _load(self, path):
+        start = time.perf_counter()
+        sound, cached = load_sound(path, self.cache_dir)
+        self.load_times[path] = time.perf_counter() - start
+        if not cached:
+            self.decoded.append(path)
+        return sound
+
+    def preload(self, paths=None):
+        """Start loading `paths` (every file in the sound folder by default) in the background."""
+        if paths is None:
+            paths = sorted(
+                os.path.join(self.sound_dir, name) for name in os.listdir(self.sound_dir)
+            )
+        with self._lock:
+            for path in paths:
+                if path not in self._loads:
+                    self._loads[path] = self._executor.submit(self._load, path)
+
+    def loaded(self, path):
+        """Whether get(path) returns without loading or waiting."""
+        future = self._loads.get(path)
+        return future is not None and future.done()
+
+    def get(self, path):
+        """The loaded sound for `path`, waiting for (or doing) the load if needed."""
+        with self._lock:
+            future = self._loads.get(path)
+            if future is not None and future.done():
+                self.hits += 1
+                return self._hand_out(future.result())
+            if future is None or future.cancel():  # not started yet, don't queue behind the others
+                future = None
+
+        start = time.perf_counter()
+        if future is None:
+            sound = self._load(path)
+            future = Future()
+            future.set_result(sound)
+            with self._lock:
+                self._loads[path] = future
+        else:
+            sound = future.result()
+        self.wait_times[path] = self.wait_times.get(path, 0.0) + time.perf_counter() - start
+        return self._hand_out(sound)
+
+    @staticmethod
+    def _hand_out(sound):
+        """
+        A streamed track can only be played by one player at a time, so every
+        caller gets its own stream of the cached file (opening one is cheap).
+        """
+        if isinstance(sound.source, pyglet.media.StreamingSource):
+            return arcade.Sound(sound.file_name, streaming=True)
+        return sound
+
+    def report(self):
+        """Print how much loading the sounds cost, and how much of it the main thread saw."""
+        loaded = sum(self.load_times.values())
+        waited = sum(self.wait_times.values())
+        print(
+            f"[INFO] Sounds: {len(self.load_times)} loaded in {loaded:.3f} s, "
+            f"main thread waited {waited:.3f} s, {self.hits} served from cache, "
+            f"{len(self.decoded)} decoded"
+        )
+        for path, seconds in sorted(self.load_times.items(), key=lambda item: -item[1]):
+            print(f"[INFO]   {path}: {seconds * 1000:.1f} ms, waited {self.wait_times.get(path, 0.0) * 1000:.1f} ms")
+
+
+sounds = SoundRegistry()
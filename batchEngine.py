@@ -0,0 +1,247 @@
+"""
+Vectorized tetris simulator for bots and heuristic tuning.
+
+BatchEngine steps N games in lockstep. The boards are one packed bitboard
+array of shape (N, ROW_COUNT + 1 + PADDING) where every row is a bitmask, and
+every rule (moves, rotation, collisions, locks, line clears, scoring, the bag)
+is applied to all boards at once with NumPy array operations.
+
+The rules follow TetrisEngine exactly, with one step being one logic tick of
+GameView at LOGIC_TICK_RATE: the action is applied first, then gravity pulls the
+stone at `gravity_for_level(level)` rows per second, several rows at once
+when the level is fast enough.
+
+Needs NumPy, which the game itself does not (pip install numpy).
+"""
+import itertools
+
+import numpy as np
+
+from constants import *
+from engine import gravity_for_level, speed_for_level
+from pieces import PIECES
+
+# actions, one per board per step
+NOOP = 0
+LEFT = 1
+RIGHT = 2
+ROTATE = 3  # counterclockwise, like the up arrow
+ROTATE_CW = 4  # clockwise, like the left shoulder
+DROP = 5
+HARD_DROP = 6
+HOLD = 7
+ACTION_COUNT = 8
+
+PADDING = 4  # full rows below the floor so a 4 row window never runs off the board
+FULL_ROW = (1 << COLUMN_COUNT) - 1
+LINE_SCORES = np.array([0, 40, 100, 300, 1200], dtype=np.int64)
+
+# MASKS[piece, rotation] is the stone padded to 4 rows of bitmasks
+MASKS = np.zeros((len(PIECES), 4, 4), dtype=np.uint32)
+WIDTHS = np.zeros((len(PIECES), 4), dtype=np.int64)
+SPAWN_X = np.zeros((len(PIECES), 4), dtype=np.int64)
+for _p, _piece in enumerate(PIECES):
+    for _r, _orientation in enumerate(_piece.orientations):
+        MASKS[_p, _r, :_orientation.height] = _orientation.masks
+        WIDTHS[_p, _r] = _orientation.width
+        SPAWN_X[_p, _r] = int(COLUMN_COUNT / 2 - _orientation.width / 2)
+
+# from this level on the stone falls at 20G, gravity_for_level stops changing
+TOP_SPEED_LEVEL = next(level for level in itertools.count(1) if speed_for_level(level) < 1)
+
+# rows per second, indexed by min(level, TOP_SPEED_LEVEL)
+GRAVITIES = np.array(
+    [0.0] + [gravity_for_level(level) for level in range(1, TOP_SPEED_LEVEL + 1)]
+)
+STEP_SECONDS = 1 / LOGIC_TICK_RATE
+
+_WINDOW = np.arange(4)
+_ALL_Y = np.arange(ROW_COUNT + 1)
+
+
+class BatchEngine:
+    """N independent games stepped together."""
+
+    def __init__(self, n, seed=None):
+        self.n = n
+        self.rng = np.random.default_rng(seed)
+
+        self.boards = np.zeros((n, ROW_COUNT + 1 + PADDING), dtype=np.uint32)
+        self.piece = np.zeros(n, dtype=np.int64)  # index into PIECES
+        self.rotation = np.zeros(n, dtype=np.int64)
+        self.x = np.zeros(n, dtype=np.int64)
+        self.y = np.zeros(n, dtype=np.int64)  # same meaning as TetrisEngine.stone_y
+        self.stored_piece = np.zeros(n, dtype=np.int64)  # -1 when nothing is stored
+        self.stored_rotation = np.zeros(n, dtype=np.int64)
+        self.bags = np.zeros((n, len(PIECES)), dtype=np.int64)
+        self.bag_pos = np.zeros(n, dtype=np.int64)
+
+        self.score = np.zeros(n, dtype=np.int64)
+        self.level = np.ones(n, dtype=np.int64)
+        self.lines = np.zeros(n, dtype=np.int64)
+        self.fall_progress = np.zeros(n)  # fraction of a row gravity has pulled so far
+        self.game_over = np.zeros(n, dtype=bool)
+
+        self.reset()
+
+    def reset(self, idx=None):
+        """Start new games on the given boards (all of them by default)."""
+        if idx is None:
+            idx = np.arange(self.n)
+        idx = np.asarray(idx, dtype=np.int64)
+        self.boards[idx] = 0
+        self.boards[idx, ROW_COUNT:] = FULL_ROW
+        self.stored_piece[idx] = -1
+        self.stored_rotation[idx] = 0
+        self.bags[idx] = self._shuffled_bags(len(idx))
+        self.bag_pos[idx] = 0
+        self.score[idx] = 0
+        self.level[idx] = 1
+        self.lines[idx] = 0
+        self.fall_progress[idx] = 0.0
+        self.game_over[idx] = False
+        self._spawn(idx, self._pop_bag(idx), np.zeros(len(idx), dtype=np.int64))
+
+    def step(self, actions):
+        """
+        Apply one action per board, then gravity.
+        Returns the number of lines each board cleared during the step.
+        """
+        actions = np.asarray(actions)
+        cleared = np.zeros(self.n, dtype=np.int64)
+        live = ~self.game_over
+
+        for action, apply in (
+            (LEFT, lambda idx: self._move(idx, -1)),
+            (RIGHT, lambda idx: self._move(idx, 1)),
+            (ROTATE, lambda idx: self._rotate(idx, 1)),
+            (ROTATE_CW, lambda idx: self._rotate(idx, -1)),
+            (DROP, lambda idx: self._drop(idx, cleared)),
+            (HARD_DROP, lambda idx: self._hard_drop(idx, cleared)),
+            (HOLD, self._hold),
+        ):
+            idx = np.flatnonzero(live & (actions == action))
+            if len(idx):
+                apply(idx)
+
+        idx = np.flatnonzero(~self.game_over)
+        self.fall_progress[idx] += GRAVITIES[np.minimum(self.level[idx], TOP_SPEED_LEVEL)] * STEP_SECONDS
+        rows = (self.fall_progress[idx] + 1e-9).astype(np.int64)  # same rounding as TetrisEngine
+        falling = rows > 0
+        if falling.any():
+            idx, rows = idx[falling], rows[falling]
+            self.fall_progress[idx] -= rows
+            self._fall(idx, rows, cleared)
+        return cleared
+
+    # ------------------------------------------------------------------
+
+    def _shuffled_bags(self, k):
+        return self.rng.random((k, len(PIECES))).argsort(axis=1)
+
+    def _pop_bag(self, idx):
+        """Take the next piece of each bag, refill the bags that ran empty."""
+        piece = self.bags[idx, self.bag_pos[idx]]
+        self.bag_pos[idx] += 1
+        empty = idx[self.bag_pos[idx] == len(PIECES)]
+        if len(empty):
+            self.bags[empty] = self._shuffled_bags(len(empty))
+            self.bag_pos[empty] = 0
+        return piece
+
+    def _collides(self, idx, piece, rotation, x, y):
+        outside = (x < 0) | (x + WIDTHS[piece, rotation] > COLUMN_COUNT)
+        shifted = MASKS[piece, rotation] << np.clip(x, 0, COLUMN_COUNT)[:, None].astype(np.uint32)
+        rows = self.boards[idx[:, None], y[:, None] + _WINDOW]
+        return outside | (rows & shifted).any(axis=1)
+
+    def _spawn(self, idx, piece, rotation):
+        self.piece[idx] = piece
+        self.rotation[idx] = rotation
+        self.x[idx] = SPAWN_X[piece, rotation]
+        self.y[idx] = 0
+        self.game_over[idx] = self._collides(idx, piece, rotation, self.x[idx], self.y[idx])
+
+    def _move(self, idx, delta_x):
+        piece, rotation = self.piece[idx], self.rotation[idx]
+        new_x = np.clip(self.x[idx] + delta_x, 0, COLUMN_COUNT - WIDTHS[piece, rotation])
+        ok = ~self._collides(idx, piece, rotation, new_x, self.y[idx])
+        self.x[idx[ok]] = new_x[ok]
+
+    def _rotate(self, idx, turns):
+        piece = self.piece[idx]
+        new_rotation = (self.rotation[idx] + turns) % 4
+        width = WIDTHS[piece, new_rotation]
+        x = self.x[idx]
+        x = np.where(x + width >= COLUMN_COUNT, COLUMN_COUNT - width, x)
+        self.x[idx] = x  # pushed off the wall even when the rotation fails, like GameView
+        ok = ~self._collides(idx, piece, new_rotation, x, self.y[idx])
+        self.rotation[idx[ok]] = new_rotation[ok]
+
+    def _drop(self, idx, cleared):
+        self.y[idx] += 1
+        hit = self._collides(idx, self.piece[idx], self.rotation[idx], self.x[idx], self.y[idx])
+        if hit.any():
+            self._lock(idx[hit], cleared)
+
+    def _landing(self, idx):
+        """First colliding row below each stone, tested for all rows at once."""
+        piece, rotation, x = self.piece[idx], self.rotation[idx], self.x[idx]
+        shifted = MASKS[piece, rotation] << x[:, None].astype(np.uint32)
+        windows = self.boards[idx[:, None, None], _ALL_Y[None, :, None] + _WINDOW]
+        hits = (windows & shifted[:, None, :]).any(axis=2)
+        hits &= _ALL_Y[None, :] >= self.y[idx][:, None]
+        return hits.argmax(axis=1)
+
+    def _hard_drop(self, idx, cleared):
+        self.y[idx] = self._landing(idx)
+        self._lock(idx, cleared)
+
+    def _fall(self, idx, rows, cleared):
+        """`rows` drops at once, locking the stones that reach their landing row."""
+        landing = self._landing(idx)
+        lands = self.y[idx] + rows >= landing
+        self.y[idx] = np.where(lands, landing, self.y[idx] + rows)
+        if lands.any():
+            self._lock(idx[lands], cleared)
+
+    def _lock(self, idx, cleared):
+        piece, rotation, x = self.piece[idx], self.rotation[idx], self.x[idx]
+        shifted = MASKS[piece, rotation] << x[:, None].astype(np.uint32)
+        rows = (self.y[idx] - 1)[:, None] + _WINDOW
+        self.boards[idx[:, None], rows] |= shifted
+
+        full = self.boards[idx, :ROW_COUNT] == FULL_ROW
+        n_lines = full.sum(axis=1)
+        has_lines = n_lines > 0
+        if has_lines.any():
+            self._clear_rows(idx[has_lines], full[has_lines], n_lines[has_lines])
+
+        level = self.level[idx]
+        self.score[idx] += LINE_SCORES[n_lines] * level
+        self.lines[idx] += n_lines
+        self.level[idx] = level + (self.score[idx] > 1000 * level ** 2)
+        cleared[idx] += n_lines
+
+        self._spawn(idx, self._pop_bag(idx), np.zeros(len(idx), dtype=np.int64))
+
+    def _clear_rows(self, idx, full, n_lines):
+        """Compact all boards in one go: every kept row moves down by the full rows below it."""
+        full_above = np.cumsum(full, axis=1)
+        dest = _ALL_Y[None, :ROW_COUNT] + (n_lines[:, None] - full_above)
+        dest[full] = ROW_COUNT  # cleared rows go to a scratch row
+        compacted = np.zeros((len(idx), ROW_COUNT + 1), dtype=np.uint32)
+        np.put_along_axis(compacted, dest, self.boards[idx, :ROW_COUNT], axis=1)
+        self.boards[idx, :ROW_COUNT] = compacted[:, :ROW_COUNT]
+
+    def _hold(self, idx):
+        stored = self.stored_piece[idx]
+        stored_rotation = self.stored_rotation[idx]
+        self.stored_piece[idx] = self.piece[idx]
+        self.stored_rotation[idx] = self.rotation[idx]
+
+        empty = stored < 0  # nothing stored yet, the stone comes out of the bag
+        if empty.any():
+            stored[empty] = self._pop_bag(idx[empty])
+            stored_rotation[empty] = 0
+        self._spawn(idx, stored, stored_rotation)
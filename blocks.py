@@ -0,0 +1,46 @@
+"""
+Block textures and colors for the cell sprites.
+
+All cells share one block texture, the skin, and get their color from the
+sprite tint. Every sprite list then points at the same region of the texture
+atlas, and recoloring a cell only changes the color vertex attribute of its
+sprite instead of rebinding a texture.
+
+Skins are images in SKIN_DIR (``skins/<name>.png``), best drawn in grays so
+the tint comes through, and are loaded once per name. Without a skin the
+blocks are flat, plain white tinted to the exact colors of ``constants.colors``.
+"""
+import os
+
+import arcade
+import PIL.Image
+
+from constants import *
+
+SKIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skins")
+
+# tints indexed by color index, like constants.colors
+block_colors = [arcade.types.Color(*color) for color in colors]
+
+_skins = {}  # skin name -> arcade.Texture
+
+
+def load_skin(name=BLOCK_SKIN):
+    """The block texture of a skin (None for flat blocks), loaded from disk only once."""
+    texture = _skins.get(name)
+    if texture is None:
+        if name is None:
+            image = PIL.Image.new("RGBA", (WIDTH, HEIGHT), (255, 255, 255, 255))
+            texture = arcade.Texture(image, hash="block-flat")
+        else:
+            texture = arcade.load_texture(os.path.join(SKIN_DIR, f"{name}.png"))
+        _skins[name] = texture
+    return texture
+
+
+def block_sprite(skin=BLOCK_SKIN, color_index=0):
+    """A cell sprite drawn with `skin`, WIDTH x HEIGHT whatever the size of the skin image."""
+    sprite = arcade.Sprite(load_skin(skin))
+    sprite.size = (WIDTH, HEIGHT)
+    sprite.color = block_colors[color_index]
+    return sprite
@@ -0,0 +1,168 @@
+"""
+Bitboard representation of the tetris playfield.
+
+Every row is stored as an integer bitmask (bit ``c`` set means column ``c`` is
+filled), so collision is a few ANDs per piece row, locking is an OR and a full
+row is a single compare. A flat color plane is kept next to the masks so the
+renderers still know which texture goes into each cell.
+
+The list based helpers in ``helpers.py`` are left untouched for code that still
+works on nested lists.
+"""
+from constants import *
+
+
+class Board:
+    """
+    Playfield of ``rows`` visible rows, plus a hidden floor row of 1's
+    at the bottom (same layout as ``helpers.new_board``).
+    """
+
+    def __init__(self, rows=ROW_COUNT, cols=COLUMN_COUNT, floor=True):
+        self.rows = rows
+        self.cols = cols
+        self.full_row = (1 << cols) - 1
+
+        self.masks = [0] * rows  # one bitmask per row
+        self.fill = [0] * rows  # number of filled cells per row
+        self.cells = bytearray(rows * cols)  # color index per cell, row major
+        if floor:  # the floor is hidden by reducing the window height
+            self.masks.append(self.full_row)
+            self.fill.append(cols)
+            self.cells += bytes([1]) * cols
+        # surface height map: row of the topmost filled cell of every column
+        self.heights = [0] * cols
+        self.update_heights()
+
+        # what changed since the renderer last synced, see take_dirty()
+        self.dirty_cells = set()  # flat indices into cells
+        self.dirty_rows = set(range(len(self.masks)))  # a new board is all dirty
+
+        # read-only (rows, cols) window on the visible part of the color plane.
+        # Rows are always shifted in place, so this never goes stale.
+        self.view = memoryview(self.cells).toreadonly()[:rows * cols].cast("B", (rows, cols))
+
+    def collides(self, masks, x, y):
+        """
+        See if a piece given by its row masks would overlap anything on the
+        board or stick out of the side walls when placed at (x, y).
+        """
+        if x < 0:
+            return True
+        board_masks = self.masks
+        if y + len(masks) > len(board_masks):
+            return True
+        full_row = self.full_row
+        for cy, mask in enumerate(masks):
+            mask <<= x
+            if mask > full_row or board_masks[y + cy] & mask:
+                return True
+        return False
+
+    def landing(self, stone, x, y):
+        """
+        First y at or below `y` where `stone` (a pieces.Orientation) collides
+        when it falls straight down from (x, y).
+
+        As long as the stone is above the surface, only the bottom cell of
+        each of its columns can hit anything, so the answer comes straight
+        from the height map. A stone tucked under an overhang falls back to
+        probing row by row.
+        """
+        heights = self.heights
+        landing_y = min(
+            heights[x + cx] - bottom for cx, bottom in enumerate(stone.bottom)
+        )
+        if landing_y > y:
+            return landing_y
+
+        landing_y = y
+        while not self.collides(stone.masks, x, landing_y):
+            landing_y += 1
+        return landing_y
+
+    def lock(self, masks, x, y, color):
+        """Merge a piece into the board with its top left corner at (x, y)."""
+        cols = self.cols
+        cells = self.cells
+        heights = self.heights
+        for cy, mask in enumerate(masks):
+            row = y + cy
+            mask <<= x
+            self.masks[row] |= mask
+            self.fill[row] += mask.bit_count()
+            base = row * cols
+            while mask:  # walk the set bits to paint the color plane
+                low = mask & -mask
+                col = low.bit_length() - 1
+                cells[base + col] = color
+                self.dirty_cells.add(base + col)
+                if row < heights[col]:
+                    heights[col] = row
+                mask ^= low
+
+    def update_heights(self):
+        """Rebuild the height map from the masks, top down."""
+        heights = self.heights
+        heights[:] = [len(self.masks)] * self.cols  # empty columns
+        full_row = self.full_row
+        seen = 0
+        for row, mask in enumerate(self.masks):
+            new = mask & ~seen
+            while new:  # columns whose first filled cell is in this row
+                low = new & -new
+                heights[low.bit_length() - 1] = row
+                new ^= low
+            seen |= mask
+            if seen == full_row:
+                return
+
+    def clear_full_rows(self, rows=None):
+        """
+        Remove the full rows among `rows` (every visible row by default) and
+        shift the rows above them down, all in a single pass. Pass the rows a
+        piece just touched to avoid looking at the rest of the board.
+        Returns the indices the removed rows had, top to bottom.
+        """
+        cols = self.cols
+        fill = self.fill
+        if rows is None:
+            rows = range(self.rows)
+        cleared = [row for row in sorted(rows) if row < self.rows and fill[row] == cols]
+        if not cleared:
+            return cleared
+
+        cells = self.cells
+        masks = self.masks
+        surface = min(self.heights)  # everything above this row is empty already
+
+        write = cleared[-1]
+        for row in range(write, surface - 1, -1):  # compact from the lowest cleared row up
+            if fill[row] == cols:
+                continue
+            if write != row:
+                masks[write] = masks[row]
+                fill[write] = fill[row]
+                cells[write * cols:(write + 1) * cols] = cells[row * cols:(row + 1) * cols]
+            write -= 1
+
+        for row in range(surface, write + 1):  # blank rows come in at the top
+            masks[row] = 0
+            fill[row] = 0
+        cells[surface * cols:(write + 1) * cols] = bytes((write + 1 - surface) * cols)
+        self.dirty_rows.update(range(surface, cleared[-1] + 1))  # every row that moved or emptied
+        self.update_heights()
+        return cleared
+
+    def take_dirty(self):
+        """
+        Hand over what changed since the last call and start a new change
+        set: the rows that changed as a whole (line clears shift them) and
+        the single cells outside those rows (locks), as flat indices.
+        """
+        rows, cells = self.dirty_rows, self.dirty_cells
+        self.dirty_rows, self.dirty_cells = set(), set()
+        if rows:
+            cols = self.cols
+            cells = {i for i in cells if i // cols not in rows}
+        return sorted(rows), cells
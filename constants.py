@@ -1,6 +1,23 @@
 # Set if CRT Mode is on
 CRT_FILTER_ON = True
 
+# Lower the CRT quality step by step when frames take longer than the shown view's
+# frame time (1/ACTIVE_RATE or 1/IDLE_RATE), judged over CRT_GOVERNOR_WINDOW frames,
+# and raise it again when there is headroom
+CRT_GOVERNOR_ON = True
+CRT_GOVERNOR_WINDOW = 120
+
+# Draw the score and level digits from pre-rendered glyphs instead of laid out text
+HUD_DIGIT_GLYPHS = False
+
+# How the board cells are drawn: "sprites" (one sprite per cell)
+# or "shader" (one quad per grid, see gridRenderer.py)
+RENDER_MODE = "sprites"
+
+# Block skin of the cell sprites, an image in skins/ without the .png (e.g. "bevel"),
+# tinted with the colors below; None draws flat blocks
+BLOCK_SKIN = None
+
 
 # Set how many rows and columns we will have
 ROW_COUNT = 24
@@ -10,6 +27,9 @@ COLUMN_COUNT = 10
 PREVIEW_ROW_COUNT = 2
 PREVIEW_COL_COUNT = 5
 
+# How many upcoming pieces the piece generator keeps ready to peek at
+NEXT_QUEUE_SIZE = 5
+
 # This sets the WIDTH and HEIGHT of each grid location
 WIDTH = 30
 HEIGHT = 30
@@ -25,6 +45,26 @@ WINDOW_TITLE = "Tetris"
 
 BORDER_WIDTH = 4 # in pixels
 
+# Gravity: the level curve is counted in frames at this rate,
+# and never falls faster than MAX_GRAVITY rows per frame (20G)
+GRAVITY_FPS = 60
+MAX_GRAVITY = 20
+
+# Game logic runs at a fixed tick rate, independent of the draw rate
+LOGIC_TICK_RATE = 60  # ticks per second
+MAX_CATCH_UP_TICKS = 5  # most ticks run in one update after a stall
+
+# Update and draw rate of the window (per second) while a view is active, and while
+# it only waits for input (menus, pause); input events still wake the window right away
+ACTIVE_RATE = 60
+IDLE_RATE = 10
+
+# Time per start menu update spent preparing the next game, see StartMenuView.on_update
+PREWARM_SLICE = 0.008  # seconds
+
+# Sound effects play on a pool of at most this many players, see mixer.py
+MIXER_VOICES = 8
+
 colors = [  # the last entry is the transparency of the color
     (0, 0, 0, 255),
     (255, 0, 0, 255),
@@ -0,0 +1,241 @@
+"""
+Process wide pool of CRT filters shared by all views.
+
+A CRTFilter owns a framebuffer and a compiled shader, so building one per view
+allocates GPU memory and compiles the shader again on every view switch and
+every new game. Here there is one CRTFilter per render target size for the
+whole process. Views borrow a SharedCRTFilter for their preset, which puts
+its parameters (plain shader uniforms) on the shared filter whenever the view
+starts drawing with it. Only one view draws at a time, so they never clash.
+
+The CRTGovernor picks the filter for every frame. It watches the frame time
+and the cost of the CRT pass and walks down QUALITY_LEVELS (smaller internal
+buffer, coarser CRT pixels, in the end no filter at all) while frames miss
+their budget, and back up once there is headroom again. The budget is the
+frame time of the rate the shown view runs at, set when the view is shown.
+
+The FrameCache keeps the last filtered frame, so a view whose scene did not
+change since its last frame only blits it to the window again.
+"""
+import time
+from collections import deque
+
+import arcade
+from arcade.experimental.crt_filter import CRTFilter
+from pyglet.math import Vec2
+
+from constants import *
+
+# filter settings of the views, as CRTFilter keyword arguments
+GAME = {
+    "resolution_down_scale": 1.0,
+    "hard_scan": -8.0,
+    "hard_pix": -3.0,
+    "display_warp": Vec2(1.0 / 100.0, 1.0 / 100.0),
+    "mask_dark": 0.5,
+    "mask_light": 1.5,
+}
+MENU = dict(GAME, display_warp=Vec2(1.0 / 32.0, 1.0 / 24.0))
+
+# CRTFilter argument -> uniform of its shader
+_UNIFORMS = {
+    "resolution_down_scale": "resolutionDownScale",
+    "hard_scan": "hardScan",
+    "hard_pix": "hardPix",
+    "display_warp": "warp",
+    "mask_dark": "maskDark",
+    "mask_light": "maskLight",
+}
+
+_filters = {}  # (width, height) -> CRTFilter
+_borrowed = {}  # (width, height, params) -> SharedCRTFilter
+_applied = {}  # (width, height) -> params currently set on that filter
+
+
+class SharedCRTFilter:
+    """A view's handle on a pooled CRTFilter, with the same use/clear/draw calls."""
+
+    def __init__(self, crt_filter, size, params):
+        self.crt_filter = crt_filter
+        self.size = size
+        self.params = params
+
+    def use(self):
+        if _applied.get(self.size) != self.params:
+            program = self.crt_filter.shadertoy.program
+            for name, value in self.params:
+                program[_UNIFORMS[name]] = value
+            _applied[self.size] = self.params
+        self.crt_filter.use()
+
+    def clear(self):
+        self.crt_filter.clear()
+
+    def draw(self):
+        self.crt_filter.draw()
+
+
+def borrow(preset=GAME, width=WINDOW_WIDTH * 2, height=WINDOW_HEIGHT * 2):
+    """The pooled filter for a render target size, set up with `preset` when used."""
+    params = tuple(sorted(preset.items()))
+    key = (width, height, params)
+    shared = _borrowed.get(key)
+    if shared is None:
+        size = (width, height)
+        if size not in _filters:
+            _filters[size] = CRTFilter(width, height, **preset)
+            _applied[size] = params
+            print(f"[INFO] CRT filter created for {width}x{height}")
+        shared = _borrowed[key] = SharedCRTFilter(_filters[size], size, params)
+    return shared
+
+
+# (internal buffer size relative to the window, resolution_down_scale),
+# best first; None means drawing without the filter
+QUALITY_LEVELS = ((2.0, 1.0), (1.5, 1.0), (1.0, 1.0), (1.0, 2.0), None)
+GPU_SAMPLE_INTERVAL = 15  # frames between two timed CRT passes
+
+
+class CRTGovernor:
+    """
+    Adapts the CRT filter quality to the measured frame time.
+
+    Views call begin_frame() at the start of on_draw, which returns the filter
+    to draw through (or None to draw straight to the window), draw_filter()
+    to run the CRT pass, and end_frame() when done.
+    """
+
+    def __init__(self, target_fps=ACTIVE_RATE, window=CRT_GOVERNOR_WINDOW, enabled=CRT_GOVERNOR_ON):
+        self.budget = 1 / target_fps  # seconds per frame
+        self.enabled = enabled
+        self.level = 0  # index into QUALITY_LEVELS
+        self.frame_times = deque(maxlen=window)  # seconds between frames
+        self.pass_times = deque(maxlen=max(window // GPU_SAMPLE_INTERVAL, 1))  # seconds per CRT pass
+        self.last_frame = None
+        self.rendered_last = False  # whether the frame since last_frame ran the full pipeline
+        self.frame = 0
+        self.hold_until = 0  # no stepping up before this frame, after a step down
+        self.query = None
+
+    def set_target_fps(self, target_fps):
+        """Budget frames for `target_fps`, the rate of the view being shown."""
+        self.budget = 1 / target_fps
+        self.reset()
+
+    def reset(self):
+        """Forget the measurements, e.g. after a view switch or a deliberate pause in drawing."""
+        self.frame_times.clear()
+        self.pass_times.clear()
+        self.last_frame = None
+        self.rendered_last = False
+
+    def _tick(self, rendered):
+        """Time the previous frame, if it was a fully rendered one."""
+        now = time.perf_counter()
+        if self.last_frame is not None and self.rendered_last:
+            frame_time = now - self.last_frame
+            if frame_time < self.budget * 4:  # longer gaps are stalls or idle views, not load
+                self.frame_times.append(frame_time)
+        self.last_frame = now
+        self.rendered_last = rendered
+
+    def skip_frame(self):
+        """Note a frame that reused the cached output, it says nothing about the load."""
+        self._tick(False)
+
+    def buffer_size(self):
+        """Size of the filter buffer at the current quality, None while the filter is bypassed."""
+        quality = QUALITY_LEVELS[self.level]
+        if quality is None:
+            return None
+        return int(WINDOW_WIDTH * quality[0]), int(WINDOW_HEIGHT * quality[0])
+
+    def begin_frame(self, preset):
+        """The filter for this frame in the current quality, or None to bypass it."""
+        self._tick(True)
+        self.frame += 1
+
+        quality = QUALITY_LEVELS[self.level]
+        if quality is None:
+            return None
+        scale, down_scale = quality
+        if down_scale != preset["resolution_down_scale"]:
+            preset = dict(preset, resolution_down_scale=down_scale)
+        return borrow(preset, int(WINDOW_WIDTH * scale), int(WINDOW_HEIGHT * scale))
+
+    def draw_filter(self, crt_filter):
+        """
+        Run the CRT pass, timing it on the GPU every GPU_SAMPLE_INTERVAL
+        frames (arcade waits for the query result, so not every frame).
+        """
+        if not self.enabled or self.frame % GPU_SAMPLE_INTERVAL:
+            crt_filter.draw()
+            return
+        if self.query is None:
+            self.query = arcade.get_window().ctx.query(samples=False, primitives=False)
+        with self.query:
+            crt_filter.draw()
+        self.pass_times.append(self.query.time_elapsed / 1e9)
+
+    def end_frame(self):
+        if not self.enabled or len(self.frame_times) < self.frame_times.maxlen:
+            return
+        frame_time = sum(self.frame_times) / len(self.frame_times)
+        pass_time = sum(self.pass_times) / len(self.pass_times) if self.pass_times else 0.0
+
+        if frame_time > self.budget * 1.2 and self.level < len(QUALITY_LEVELS) - 1:
+            self._step(1, frame_time, pass_time)
+        elif (
+            frame_time < self.budget * 1.05
+            and pass_time < self.budget * 0.25  # the better level has room to cost more
+            and self.level > 0
+            and self.frame >= self.hold_until
+        ):
+            self._step(-1, frame_time, pass_time)
+
+    def _step(self, direction, frame_time, pass_time):
+        self.level += direction
+        if direction > 0:  # wait longer before trying the level that just failed again
+            self.hold_until = self.frame + self.frame_times.maxlen * 4
+        quality = QUALITY_LEVELS[self.level]
+        if quality is None:
+            setting = "filter bypassed"
+        else:
+            setting = f"buffer {quality[0]:g}x, resolution_down_scale {quality[1]:g}"
+        print(
+            f"[INFO] CRT quality {'down' if direction > 0 else 'up'} to level {self.level} ({setting}): "
+            f"{frame_time * 1000:.1f} ms per frame, CRT pass {pass_time * 1000:.1f} ms, "
+            f"budget {self.budget * 1000:.1f} ms"
+        )
+        self.reset()  # judge the new level on its own frames
+
+
+class FrameCache:
+    """The last CRT output of a view, to show again while its scene is unchanged."""
+
+    def __init__(self):
+        self.framebuffer = None
+        self.owner = None  # the view the cached frame belongs to
+
+    def holds(self, owner, size):
+        return self.owner is owner and self.framebuffer is not None and self.framebuffer.size == size
+
+    def invalidate(self):
+        self.owner = None
+
+    def target(self, owner, size):
+        """The framebuffer to render `owner`'s next frame into, the window's size."""
+        if self.framebuffer is None or self.framebuffer.size != size:
+            ctx = arcade.get_window().ctx
+            self.framebuffer = ctx.framebuffer(color_attachments=[ctx.texture(size, components=4)])
+        self.owner = owner
+        return self.framebuffer
+
+    def present(self):
+        """Blit the cached frame to the window."""
+        ctx = arcade.get_window().ctx
+        ctx.copy_framebuffer(self.framebuffer, ctx.screen, depth=False)
+
+
+governor = CRTGovernor()  # shared by all views, the budget follows the shown view's rate
+frame_cache = FrameCache()
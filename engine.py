@@ -0,0 +1,250 @@
+"""
+Headless tetris rules.
+
+TetrisEngine owns the board, the falling stone, the bag, the stored stone and
+the score. It imports neither arcade nor PIL, so games can be simulated without
+a window. Views drive it through its methods and react to the events it
+dispatches (sounds, sprites, view switching).
+"""
+import math
+from types import MappingProxyType
+
+from pyglet.event import EventDispatcher
+
+from constants import *
+from board import Board
+from pieces import rotated
+from randomizer import BagRandomizer
+
+
+def speed_for_level(level):
+    """Number of frames between two gravity drops at a given level."""
+    return math.floor(-20 * math.log10(level / 50))
+
+
+def gravity_for_level(level):
+    """
+    Falling speed in rows per second at a given level. Follows the frame
+    based curve above, and stays at 20G once that curve reaches 0 frames.
+    """
+    frames = speed_for_level(level)
+    if frames < 1:
+        return MAX_GRAVITY * GRAVITY_FPS
+    return GRAVITY_FPS / frames
+
+
+class TetrisEngine(EventDispatcher):
+    """
+    Game rules, without any rendering or sound.
+
+    Events:
+        on_piece_spawned()        a new stone is at the top of the board
+        on_piece_locked(lines)    a stone was merged into the board, clearing `lines` rows
+        on_lines_cleared(rows)    the full rows at these indices were removed, all at once
+        on_game_over()            a new stone collided right where it spawned
+    """
+
+    def __init__(self, seed=None, lookahead=NEXT_QUEUE_SIZE):
+        self.seed = seed  # None picks a new random seed for every game
+        self.lookahead = lookahead
+        self.randomizer = None  # deals the pieces, see randomizer.BagRandomizer
+        self.board = None
+        self.score = 0
+        self.level = 1
+        self.lines = 0
+        self.gravity = gravity_for_level(self.level)  # rows per second
+        self.fall_progress = 0.0  # fraction of a row gravity has pulled so far
+        self.game_over = False
+
+        self.stone = None  # current stone in hand, as an orientation of a piece
+        self.next_stone = None  # next piece in line for preview
+        self.stone_x = 0  # top left coordinate of stone (empty included)
+        self.stone_y = 0  # the stone is drawn and locked one row above this
+        self.stored_stone = None
+
+        self.version = 0  # bumped on every change, see snapshot()
+        self._snapshot = None
+
+    def start(self):
+        """Reset the board and score and spawn the first stone."""
+        self.board = Board(ROW_COUNT, COLUMN_COUNT)
+        self.score = 0
+        self.level = 1
+        self.lines = 0
+        self.gravity = gravity_for_level(self.level)
+        self.fall_progress = 0.0
+        self.game_over = False
+        self.stored_stone = None
+        self.randomizer = BagRandomizer(self.seed, self.lookahead)
+        self.spawn()
+
+    def spawn(self, stone=None):
+        """
+        Put `stone` at the top of the board, or deal a new stone from the bag
+        if none is given. If we immediately collide, then game-over.
+        """
+        if stone is None:
+            stone = self.randomizer.pop().orientations[0]
+        self.next_stone = self.randomizer.peek()[0]
+
+        self.stone = stone
+        self.stone_x = int(COLUMN_COUNT / 2 - stone.width / 2)
+        self.stone_y = 0
+        self.version += 1
+        self.dispatch_event("on_piece_spawned")
+
+        if self.board.collides(stone.masks, self.stone_x, self.stone_y):
+            self.game_over = True
+            self.dispatch_event("on_game_over")
+
+    def calculate_score(self, n_lines):
+        """Calculate the score given a level and number of lines"""
+        match n_lines:
+            case 1:
+                return 40 * self.level
+            case 2:
+                return 100 * self.level
+            case 3:
+                return 300 * self.level
+            case 4:
+                return 1200 * self.level
+
+        return 0
+
+    def lock(self):
+        """
+        Merge the stone into the board one row above where it collided,
+        clear full rows, score them and spawn the next stone.
+        """
+        top = self.stone_y - 1
+        self.board.lock(self.stone.masks, self.stone_x, top, self.stone.piece_id)
+        self.version += 1
+        # only the rows the stone landed on can have become full
+        cleared_rows = self.board.clear_full_rows(range(top, top + self.stone.height))
+        lines_deleted = len(cleared_rows)
+
+        self.lines += lines_deleted
+        self.score += self.calculate_score(lines_deleted)
+        if self.score > 1000 * self.level ** 2:
+            self.level += 1
+            self.gravity = gravity_for_level(self.level)
+
+        if cleared_rows:
+            self.dispatch_event("on_lines_cleared", cleared_rows)
+        self.dispatch_event("on_piece_locked", lines_deleted)
+        self.spawn()
+
+    def update(self, delta_time):
+        """Let gravity pull the stone for `delta_time` seconds, possibly several rows at once."""
+        if self.game_over:
+            return
+        self.fall_progress += self.gravity * delta_time
+        rows = int(self.fall_progress + 1e-9)  # don't lose a row to rounding
+        if rows:
+            self.fall_progress -= rows
+            self.fall(rows)
+
+    def fall(self, rows):
+        """
+        Same as `rows` drops in a row: move the stone down, or lock it on its
+        landing row if it gets there on the way.
+        """
+        landing_y = self.ghost_position()
+        if self.stone_y + rows >= landing_y:
+            self.stone_y = landing_y
+            self.lock()
+        else:
+            self.stone_y += rows
+            self.version += 1
+
+    def drop(self):
+        """Drop the stone down one place, lock it if it collided."""
+        if self.game_over:
+            return
+        self.stone_y += 1
+        self.version += 1
+        if self.board.collides(self.stone.masks, self.stone_x, self.stone_y):
+            self.lock()
+
+    def hard_drop(self):
+        """Instantly drop the current stone to its lowest valid position and lock it."""
+        if self.game_over:
+            return
+        self.stone_y = self.ghost_position()
+        self.lock()
+
+    def move(self, delta_x):
+        """Move the stone back and forth based on delta x."""
+        if self.game_over:
+            return
+        new_x = self.stone_x + delta_x
+        if new_x < 0:
+            new_x = 0
+        if new_x > COLUMN_COUNT - self.stone.width:
+            new_x = COLUMN_COUNT - self.stone.width
+        if new_x != self.stone_x and not self.board.collides(self.stone.masks, new_x, self.stone_y):
+            self.stone_x = new_x
+            self.version += 1
+
+    def rotate(self, turns=1):
+        """Rotate the stone counterclockwise `turns` times (-1 is clockwise), check collision."""
+        if self.game_over:
+            return
+        new_stone = rotated(self.stone, turns)
+        if self.stone_x + new_stone.width >= COLUMN_COUNT:
+            self.stone_x = COLUMN_COUNT - new_stone.width
+        if not self.board.collides(new_stone.masks, self.stone_x, self.stone_y):
+            self.stone = new_stone
+        self.version += 1  # the push off the wall counts even if the rotation failed
+
+    def hold(self):
+        """Store the current stone, continue with the previously stored one (or a new one)."""
+        if self.game_over:
+            return
+        previous = self.stored_stone
+        self.stored_stone = self.stone
+        self.spawn(previous)
+
+    def next_queue(self, n=None):
+        """The next `n` pieces that will be dealt, by default as many as the lookahead."""
+        return self.randomizer.peek(self.lookahead if n is None else n)
+
+    def ghost_position(self):
+        """First row (in stone_y terms) where the current stone would collide."""
+        return self.board.landing(self.stone, self.stone_x, self.stone_y)
+
+    def snapshot(self):
+        """
+        Read-only view of the live game state, for agents, overlays and
+        telemetry. Only rebuilt when `version` changed since the last call,
+        so consumers can compare versions and skip unchanged ticks.
+
+        "board" is a (ROW_COUNT, COLUMN_COUNT) memoryview of color indices
+        over the board's own buffer, never a copy (numpy.asarray works on it).
+        "y" and "ghost_y" are board rows of the stone's top row, which is
+        -1 right after a spawn.
+        """
+        if self._snapshot is None or self._snapshot["version"] != self.version:
+            stored_stone = self.stored_stone
+            self._snapshot = MappingProxyType({
+                "version": self.version,
+                "board": self.board.view,
+                "piece": self.stone.piece_id,
+                "rotation": self.stone.rotation,
+                "x": self.stone_x,
+                "y": self.stone_y - 1,  # the stone is drawn one row above stone_y
+                "ghost_y": self.ghost_position() - 1,
+                "hold": None if stored_stone is None else stored_stone.piece_id,
+                "next_queue": tuple(piece.id for piece in self.next_queue()),
+                "score": self.score,
+                "level": self.level,
+                "lines": self.lines,
+                "game_over": self.game_over,
+            })
+        return self._snapshot
+
+
+TetrisEngine.register_event_type("on_piece_spawned")
+TetrisEngine.register_event_type("on_piece_locked")
+TetrisEngine.register_event_type("on_lines_cleared")
+TetrisEngine.register_event_type("on_game_over")
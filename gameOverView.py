@@ -1,26 +1,23 @@
 import arcade
 
 from helpers import *
-from ViewWithGamepadSupport import ViewWithGamepadSupport
+from audio import sounds
+import crt
+from ViewWithGamepadSupport import ViewWithGamepadSupport, IDLE
 
 class GameOverView(ViewWithGamepadSupport):
+    activity = IDLE  # only waits for input
+
     def __init__(self,score=0,level =0):
         super().__init__()
-        # Create the crt filter
-        self.crt_filter = CRTFilter(WINDOW_WIDTH*2, WINDOW_HEIGHT*2,
-                                    resolution_down_scale=1.0,
-                                    hard_scan=-8.0,
-                                    hard_pix=-3.0,
-                                    display_warp=Vec2(1.0 / 32.0, 1.0 / 24.0),
-                                    mask_dark=0.5,
-                                    mask_light=1.5)
-        self.filter_on = CRT_FILTER_ON
+        self.crt_preset = crt.MENU
         self.score = score
         self.level = level
-        self.bgm = arcade.load_sound('sounds/game_over.mp3')
+        self.bgm = sounds.get('sounds/game_over.mp3')
 
     def on_show_view(self):
         """ This is run once when we switch to this view """
+        super().on_show_view()
         self.window.background_color = arcade.csscolor.BLACK
 
         # Reset the viewport, necessary if we have a scrolling game and we need
@@ -45,22 +42,10 @@ class GameOverView(ViewWithGamepadSupport):
         )
         self.bgm.play()
 
-    def on_draw(self):
+    def draw(self):
         """ Draw this view """
-        if self.filter_on:
-            self.crt_filter.use()
-            self.crt_filter.clear()
-            self.title_text.draw()
-            self.instruction_text.draw()
-
-            self.window.use()
-            self.clear()
-            self.crt_filter.draw()
-
-        else:
-            self.clear()
-            self.title_text.draw()
-            self.instruction_text.draw()
+        self.title_text.draw()
+        self.instruction_text.draw()
 
     def on_mouse_press(self, _x, _y, _button, _modifiers):
         """ If the user presses the mouse button, close the game. """
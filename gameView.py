@@ -1,197 +1,160 @@
-import math
 from enum import unique
 
 import arcade.key
 
 from helpers import *
+import crt
+from audio import sounds
+from mixer import mixer
+from engine import TetrisEngine
+from hud import Hud
+from blocks import block_sprite
+from pieceSprites import PieceSprites
+from gridRenderer import GridRenderer
+from staticLayer import StaticLayer
+from pieces import PIECES, EMPTY_PREVIEW
 from gameOverView import GameOverView
-from ViewWithGamepadSupport import ViewWithGamepadSupport
+from ViewWithGamepadSupport import ViewWithGamepadSupport, ACTIVE, IDLE
+
+MAIN_BGM = 'sounds/main_bgm.mp3'
+# sound effects: name in the mixer -> (sound file, most copies playing at once), see mixer.py
+EFFECTS = {
+    "move": ('sounds/move.mp3', 2),
+    "drop": ('sounds/drop.mp3', 2),
+    "fall": ('sounds/fall.mp3', 2),
+    "line_clear": ('sounds/clear_line.mp3', 1),
+    "rotate": ('sounds/rotate.mp3', 2),
+    "store": ('sounds/store.mp3', 1),
+    "pause": ('sounds/pause.mp3', 1),
+    "resume": ('sounds/resume.mp3', 1),
+    "hard_drop": ('sounds/hard_drop.mp3', 1),
+}
+GAME_SOUNDS = [MAIN_BGM] + [path for path, _ in EFFECTS.values()]
+
 
 class GameView(ViewWithGamepadSupport):
     """Main application class."""
 
     def __init__(self):
         super().__init__()
-        self.window.background_color = arcade.color.BLACK
-        self.crt_filter = CRTFilter(WINDOW_WIDTH*2, WINDOW_HEIGHT*2,
-                                    resolution_down_scale=1.0,
-                                    hard_scan=-8.0,
-                                    hard_pix=-3.0,
-                                    display_warp=Vec2(1.0 / 100.0, 1.0 / 100.0),
-                                    mask_dark=0.5,
-                                    mask_light=1.5)
-        self.filter_on = CRT_FILTER_ON
-
-        self.preview_board_text = arcade.Text(
-            "Next Piece",
-            x=(MARGIN + WIDTH) * (COLUMN_COUNT + 1 ),
-            y=WINDOW_HEIGHT - (MARGIN *2 + HEIGHT),
-            color=arcade.color.WHITE,
-            font_size=20,
-            anchor_x="left",
-        )
-
-        self.stored_board_text = arcade.Text(
-            "Stored Piece",
-            x=(MARGIN + WIDTH) * (COLUMN_COUNT + 1),
-            y=WINDOW_HEIGHT - (MARGIN + HEIGHT) * 6,
-            color=arcade.color.WHITE,
-            font_size=20,
-            anchor_x="left",
-        )
 
-        self.score_text = arcade.Text(
-            "Score: \n0",
-            x=(MARGIN + WIDTH) * (COLUMN_COUNT + 1),
-            y=WINDOW_HEIGHT - (MARGIN + HEIGHT) * 12,
-            color=arcade.color.WHITE,
-            font_size=20,
-            anchor_x="left",
-            multiline=True,
-            width = WIDTH * 4
-        )
+        self.hud = None  # titles, score and level, built by setup like the sprites
+        self.static_layer = None
+        self.piece_sprites = None  # falling stone and ghost
 
-        self.level_text = arcade.Text(
-            "level: \n1",
-            x=(MARGIN + WIDTH) * (COLUMN_COUNT + 1),
-            y=WINDOW_HEIGHT - (MARGIN + HEIGHT) * 15,
-            color=arcade.color.WHITE,
-            font_size=20,
-            anchor_x="left",
-            multiline=True,
-            width=WIDTH * 4
-        )
+        self.engine = TetrisEngine()  # the game rules, this view only draws and plays sounds
+        self.engine.push_handlers(self)
 
-        self.board = None  # init of main board
         self.board_preview = None  # init of the preview board
         self.board_stored = None
-        self.start_frame = 0
-        self.game_over = False
+        self.shown_preview = None  # what the preview sprites currently show
+        self.shown_stored = None
         self.paused = False
         self.board_sprite_list = None  # init of board blocks/boxes
         self.board_preview_sprite_list = None  # init of preview blocks/boxes
         self.board_stored_sprite_list = None # init of stored stone region
+        self.board_grid = None  # the same three grids, when RENDER_MODE is "shader"
+        self.preview_grid = None
+        self.stored_grid = None
 
-        self.score = 0 # init of score keeper
-        self.level = 1
-        self.speed = math.floor(-20*math.log10((self.level)/50))
-
-        self.stone = None  # current stone in hand
-        self.next_stone = None  # next stone in line for preview
-        self.stone_x = 0  # top left coordinate of stone (empty included)
-        self.stone_y = 0
-        self.stored_stone = None
-
-        self.ghost_x = self.stone_x  # coordinate for landing prediction
+        self.ghost_x = 0  # coordinate for landing prediction
         self.ghost_y = 0
+        self.drawn_version = None  # engine.version on screen, see on_draw
 
-        self.stones = tetris_shapes.copy()  # query of stone to pick from
-        random.shuffle(self.stones)
-
-        # load sounds
-        self.bgm = arcade.load_sound('sounds/main_bgm.mp3')
+        self.bgm = None  # loaded by setup, played from on_show_view
         self.bgm_player = None
 
-        self.move_sound = arcade.load_sound('sounds/move.mp3')
-        self.move_sound_player = None
-
-        self.drop_sound = arcade.load_sound('sounds/drop.mp3')
-        self.drop_sound_player = None
-
-        self.stone_fallen_sound = arcade.load_sound('sounds/fall.mp3')
-        self.stone_fallen_sound_player = None
-
-        self.line_clear_sound = arcade.load_sound('sounds/clear_line.mp3')
-        self.line_clear_sound_player = None
-
-        self.rotate_sound = arcade.load_sound('sounds/rotate.mp3')
-        self.rotate_sound_player = None
+    def on_piece_spawned(self):
+        """Refresh the preview boxes and the landing prediction for the new stone."""
+        self.board_preview = self.engine.next_stone.preview  # refresh the preview box
+        self.update_store_board()
+        self.update_board()
+        self.ghost_x = self.engine.stone_x  # update the ghost coordinates
+        self.ghost_y = self.ghost_piece_position()  # predict the landing positiion
 
-        self.store_sound = arcade.load_sound('sounds/store.mp3')
-        self.store_sound_player = None
+    def on_lines_cleared(self, rows):
+        mixer.play("line_clear")  # once, however many rows
 
-        self.pause_sound = arcade.load_sound('sounds/pause.mp3')
-        self.pause_sound_player = None
+    def on_piece_locked(self, lines):
+        mixer.play("fall")
+        self.hud.update(self.engine.score, self.engine.level)
 
-        self.resume_sound = arcade.load_sound('sounds/resume.mp3')
-        self.resume_sound_player = None
+    def on_game_over(self):
+        self.bgm.stop(self.bgm_player)
+        game_view = GameOverView(self.engine.score, self.engine.level)
+        self.window.show_view(game_view)
 
-        self.hard_drop_sound = arcade.load_sound('sounds/hard_drop.mp3')
-        self.hard_drop_sound_player = None
+    def setup(self):
+        """Set up the game variables, board and sprite list"""
+        for _ in self.setup_steps():
+            pass
 
-    def new_stone(self,store=False):
+    def setup_steps(self):
         """
-        Randomly grab a new stone from the bag of stones,
-        if the bag is empty refill the bag and shuffle it.
-        Then set the stone's location to the top.
-        If we immediately collide, then game-over.
+        setup() in small steps, as a generator yielding between them, so the
+        start menu can spread the work over its idle frames.
         """
-        if store: # logic for storage of a piece.
-            if self.stored_stone is None:
-                self.stone = self.stones.pop(0)
-            else:
-                self.stone = self.stored_stone
+        # sounds.get waits for any sound still loading in the background
+        self.bgm = sounds.get(MAIN_BGM)
+        for name, (path, voices) in EFFECTS.items():
+            mixer.add(name, sounds.get(path), voices=voices)
+        yield
+
+        self.hud = Hud()  # laid out once
+        yield
+        self.static_layer = StaticLayer(self.draw_static)
+        self.piece_sprites = PieceSprites()
+        yield
+        # bake the titles and boxes for the buffer the first frame draws into
+        size = crt.governor.buffer_size() if self.filter_on else None
+        self.static_layer.bake(size or self.window.get_framebuffer_size())
+        yield
+
+        self.board_preview = EMPTY_PREVIEW
+        self.board_stored = EMPTY_PREVIEW
+        self.shown_preview = EMPTY_PREVIEW  # new sprites start out blank
+        self.shown_stored = EMPTY_PREVIEW
+
+        if RENDER_MODE == "shader":
+            self.setup_grids()
+            yield
         else:
-            self.stone = self.stones.pop(0)  # get the first 1 and remove it from the list
-        if not self.stones:  # Implemented bag system, so that no two pieces are repeated after each other.
-            self.stones = tetris_shapes.copy()
-            random.shuffle(self.stones)
-        self.next_stone = self.stones[0]  # set the next one to be the preview
-
-
-        self.board_preview = new_board(
-            PREVIEW_ROW_COUNT, PREVIEW_COL_COUNT
-        )  # refresh the board
-        x_offset = 0
-        if len(self.next_stone[0]) == 2:  # make the 2x2 stone to show in the middle
-            x_offset = 1
-        self.board_preview = (
-            join_matrixes(  # join the preview stone with the small preview board
-                self.board_preview, self.next_stone, (x_offset, 0)
-            )
-        )
-        self.update_board()
+            yield from self.setup_sprites()
 
-        # Place a new stone on the board
-        self.stone_x = int(COLUMN_COUNT / 2 - len(self.stone[0]) / 2)
-        self.stone_y = 0
-        self.ghost_x = self.stone_x  # update the ghost coordinates
-        self.ghost_y = self.ghost_piece_position()  # predict the landing positiion
+        self.engine.start()
+        self.hud.update(self.engine.score, self.engine.level)
 
-        if check_collision(self.board, self.stone, (self.stone_x, self.stone_y)):
-            self.game_over = True
-            self.bgm.stop(self.bgm_player)
-            game_view = GameOverView(self.score,self.level)
-            self.window.show_view(game_view)
+    def on_show_view(self):
+        super().on_show_view()
+        self.window.background_color = arcade.color.BLACK
+        self.bgm_player = self.bgm.play(loop=True)
 
-    def setup(self):
-        """Set up the game variables, board and sprite list"""
-        self.board = new_board(ROW_COUNT, COLUMN_COUNT)
-        self.board_preview = new_board(PREVIEW_ROW_COUNT, PREVIEW_COL_COUNT)
-        self.board_stored = new_board(PREVIEW_ROW_COUNT, PREVIEW_COL_COUNT)
-        self.start_frame = GLOBAL_CLOCK.ticks
+    def on_hide_view(self):
+        super().on_hide_view()
+        mixer.stop()  # no effects of this game left playing over the next view
 
+    def setup_sprites(self):
+        """One sprite per cell of the board and of the preview boxes, yielding after every row of them."""
         self.board_sprite_list = arcade.SpriteList()
         self.board_preview_sprite_list = arcade.SpriteList()
         self.board_stored_sprite_list = arcade.SpriteList()
 
         # spritify the main board
-        for row in range(len(self.board)):
-            for column in range(len(self.board[0])):
-                sprite = arcade.Sprite(texture_list[0])
-                sprite.textures = texture_list
+        for row in range(ROW_COUNT + 1):  # the hidden floor row is part of the board
+            for column in range(COLUMN_COUNT):
+                sprite = block_sprite()
                 sprite.center_x = (MARGIN + WIDTH) * column + MARGIN + WIDTH // 2
                 sprite.center_y = (
                     WINDOW_HEIGHT - (MARGIN + HEIGHT) * (1 + row) + MARGIN + HEIGHT // 2
                 )
 
                 self.board_sprite_list.append(sprite)
+            yield
 
         # spritify the preview board
-        for row in range(len(self.board_preview)):
-            for column in range(len(self.board_preview[0])):
-                sprite = arcade.Sprite(texture_list[0])
-                sprite.textures = texture_list
+        for row in range(PREVIEW_ROW_COUNT):
+            for column in range(PREVIEW_COL_COUNT):
+                sprite = block_sprite()
                 sprite.center_x = (
                     (MARGIN + WIDTH) * (COLUMN_COUNT + 1 + column) + MARGIN + WIDTH // 2
                 )
@@ -200,12 +163,12 @@ class GameView(ViewWithGamepadSupport):
                 )
 
                 self.board_preview_sprite_list.append(sprite)
+            yield
 
         # spritify the stored stone board
-        for row in range(len(self.board_stored)):
-            for column in range(len(self.board_stored[0])):
-                sprite = arcade.Sprite(texture_list[0])
-                sprite.textures = texture_list
+        for row in range(PREVIEW_ROW_COUNT):
+            for column in range(PREVIEW_COL_COUNT):
+                sprite = block_sprite()
                 sprite.center_x = (
                         (MARGIN + WIDTH) * (COLUMN_COUNT + 1 + column) + MARGIN + WIDTH // 2
                 )
@@ -213,180 +176,87 @@ class GameView(ViewWithGamepadSupport):
                         WINDOW_HEIGHT - (MARGIN + HEIGHT) * (6 + row +PREVIEW_ROW_COUNT) + MARGIN + HEIGHT // 2
                 )
                 self.board_stored_sprite_list.append(sprite)
-
-
-
-        self.new_stone()
-        self.update_board()
-        self.bgm_player = self.bgm.play(loop=True)
-
-    def calculate_score(self,n_lines):
-        """Calculate the score given a level and number of lines"""
-        match n_lines:
-            case 1:
-                return 40*self.level
-            case 2:
-                return 100*self.level
-            case 3:
-                return 300*self.level
-            case 4:
-                return 1200*self.level
-
-        return 0
-
-    def clear_lines(self):
-        lines_deleted = 0
-        while True:
-            for i, row in enumerate(self.board[:-1]):
-                if 0 not in row:  # remove row is it is filled
-                    lines_deleted += 1
-                    self.board = remove_row(self.board, i)
-                    self.line_clear_sound.play()
-                    break
-
-            else:
-                self.stone_fallen_sound.play()
-                break
-
-        self.score += self.calculate_score(lines_deleted)
-        self.score_text = arcade.Text(
-            f"Score: \n{self.score}",
-            x=(MARGIN + WIDTH) * (COLUMN_COUNT + 1),
-            y=WINDOW_HEIGHT - (MARGIN + HEIGHT) * 12,
-            color=arcade.color.WHITE,
-            font_size=20,
-            anchor_x="left",
-            multiline=True,
-            width=WIDTH * 4
+            yield
+
+    def setup_grids(self):
+        """One shader drawn grid each for the board and the preview boxes."""
+        self.board_grid = GridRenderer(
+            COLUMN_COUNT, ROW_COUNT + 1,  # the hidden floor row is part of the board
+            MARGIN + WIDTH // 2,
+            WINDOW_HEIGHT - (MARGIN + HEIGHT) + MARGIN + HEIGHT // 2,
+        )
+        self.preview_grid = GridRenderer(
+            PREVIEW_COL_COUNT, PREVIEW_ROW_COUNT,
+            (MARGIN + WIDTH) * (COLUMN_COUNT + 1) + MARGIN + WIDTH // 2,
+            WINDOW_HEIGHT - (MARGIN + HEIGHT) * 3 + MARGIN + HEIGHT // 2,
+        )
+        self.stored_grid = GridRenderer(
+            PREVIEW_COL_COUNT, PREVIEW_ROW_COUNT,
+            (MARGIN + WIDTH) * (COLUMN_COUNT + 1) + MARGIN + WIDTH // 2,
+            WINDOW_HEIGHT - (MARGIN + HEIGHT) * (6 + PREVIEW_ROW_COUNT) + MARGIN + HEIGHT // 2,
         )
-        if self.score > 1000* self.level **2:
-            self.level += 1
-            self.level_text = arcade.Text(
-                f"level: \n{self.level}",
-                x=(MARGIN + WIDTH) * (COLUMN_COUNT + 1),
-                y=WINDOW_HEIGHT - (MARGIN + HEIGHT) * 15,
-                color=arcade.color.WHITE,
-                font_size=20,
-                anchor_x="left",
-                multiline=True,
-                width=WIDTH * 4
-            )
-            self.speed = math.floor(-20 * math.log10(self.level / 50))
-
 
     def drop(self):
-        """
-        Drop the stone down one place.
-        Check for collision.
-        If collided, then
-          join matrixes
-          Check for rows we can remove
-          Update sprite list with stones
-          Create a new stone
-        """
-        if not self.game_over and not self.paused:
-            self.stone_y += 1
-            if check_collision(self.board, self.stone, (self.stone_x, self.stone_y)):
-                self.board = join_matrixes(
-                    self.board, self.stone, (self.stone_x, self.stone_y)
-                )
-                self.clear_lines()
-
-                self.update_board()
-                self.new_stone()
+        """Drop the stone down one place, the engine locks it if it collided."""
+        if not self.paused:
+            mixer.play("drop")  # first, a drop that ends the game hides this view
+            self.engine.drop()
 
     def hard_drop(self):
         """Instantly drop the current stone to its lowest valid position."""
-        if self.game_over or self.paused:
+        if self.engine.game_over or self.paused:
             return
+        mixer.play("hard_drop")  # first, a drop that ends the game hides this view
+        self.engine.hard_drop()
 
-        # Move the stone down until collision
-        while not check_collision(self.board, self.stone, (self.stone_x, self.stone_y + 1)):
-            self.stone_y += 1
-        self.stone_y += 1
-
-        # Lock the stone in place
-        self.board = join_matrixes(self.board, self.stone, (self.stone_x, self.stone_y))
-
-        # Clear full lines
-        self.clear_lines()
+    def rotate_stone(self, turns=1):
+        """Rotate the stone counterclockwise `turns` times (-1 is clockwise), check collision."""
+        if not self.paused:
+            self.engine.rotate(turns)
 
-        # Spawn new stone and update visuals
-        self.update_board()
-        self.new_stone()
-        self.hard_drop_sound_player = self.hard_drop_sound.play()
-
-    def rotate_stone(self):
-        """Rotate the stone, check collision."""
-        if not self.game_over and not self.paused:
-            new_stone = rotate_counterclockwise(self.stone)
-            if self.stone_x + len(new_stone[0]) >= COLUMN_COUNT:
-                self.stone_x = COLUMN_COUNT - len(new_stone[0])
-            if not check_collision(self.board, new_stone, (self.stone_x, self.stone_y)):
-                self.stone = new_stone
-
-    def on_update(self, delta_time):
-        """Update, drop stone if warranted"""
+    def on_logic_tick(self, delta_time):
+        """Logic tick, let gravity pull the stone down"""
         # This is the mechanism where time progresses
-        if GLOBAL_CLOCK.ticks_since(self.start_frame) % self.speed == 0:
-            self.drop()
+        if not self.paused:
+            self.engine.update(delta_time)
 
     def move(self, delta_x):
         """Move the stone back and forth based on delta x."""
-        if not self.game_over and not self.paused:
-            self.move_sound_player = self.move_sound.play()
-            new_x = self.stone_x + delta_x
-            if new_x < 0:
-                new_x = 0
-            if new_x > COLUMN_COUNT - len(self.stone[0]):
-                new_x = COLUMN_COUNT - len(self.stone[0])
-            if not check_collision(self.board, self.stone, (new_x, self.stone_y)):
-                self.stone_x = new_x
+        if not self.engine.game_over and not self.paused:
+            mixer.play("move")
+            self.engine.move(delta_x)
+
+    @property
+    def activity(self):
+        return IDLE if self.paused else ACTIVE
 
     def get_state(self):
-        return {"board": None, "score": 0, "level": 1, "lines": 0, "next_queue": []}
+        """Live, read-only game state, see TetrisEngine.snapshot."""
+        return self.engine.snapshot()
 
     def update_store_board(self):
-        self.board_stored = new_board(
-            PREVIEW_ROW_COUNT, PREVIEW_COL_COUNT
-        )  # refresh the board
-        x_offset = 0
-        piece_id = 0
-
-        # see what piece was stored
-        if self.stored_stone is not None:
-            piece_id = set(self.stored_stone[0])
-            piece_id.discard(0)
-            piece_id = piece_id.pop()
-
-        if self.stored_stone is not None and piece_id == 7:  # make the 2x2 stone to show in the middle
-            x_offset = 1
-
-        if self.stored_stone is not None:
-            self.board_stored = (
-                join_matrixes(  # join the stores stone with the small preview board
-                    # make sure to use the non-rotated version of the piece so no out of bounds error is thrown
-                    self.board_stored, tetris_shapes[piece_id-1], (x_offset, 0)
-                )
-            )
+        stored_stone = self.engine.stored_stone
+        if stored_stone is None:
+            self.board_stored = EMPTY_PREVIEW
+        else:
+            # the preview always shows the non-rotated version of the piece
+            self.board_stored = PIECES[stored_stone.piece_id - 1].preview
 
     def store_stone(self): # Method to store current stone.
-        self.store_sound_player = self.store_sound.play()
-        temp_stored_stone = self.stone
-        self.new_stone(store=True) # create a new stone, call the store flag to activate related logic
-        self.stored_stone = temp_stored_stone
-        self.update_store_board()
-        self.update_board()
+        mixer.play("store")
+        self.engine.hold()  # the spawn event refreshes the stored piece box
 
     def pause(self):
+        self.scene_changed = True
         if self.paused:
             self.paused = False
-            self.resume_sound_player = self.resume_sound.play()
+            mixer.play("resume")
             self.bgm_player.play()
         else:
             self.paused = True
             self.bgm_player.pause()
-            self.pause_sound_player = self.pause_sound.play()
+            mixer.play("pause")
+        self.apply_activity()
 
     def on_key_press(self, key, modifiers):
         """
@@ -404,10 +274,9 @@ class GameView(ViewWithGamepadSupport):
                 self.move(1)
             elif key == arcade.key.UP:
                 self.rotate_stone()
-                self.rotate_sound_player = self.rotate_sound.play()
+                mixer.play("rotate")
             elif key == arcade.key.DOWN:
                 self.drop()
-                self.drop_sound_player = self.drop_sound.play()
             elif key == arcade.key.SPACE:
                 self.store_stone()
             elif key == arcade.key.C:
@@ -417,23 +286,22 @@ class GameView(ViewWithGamepadSupport):
             self.pause()
 
         # update the position of ghost piece
-        self.ghost_x, self.ghost_y = self.stone_x, self.ghost_piece_position()
+        self.update_ghost()
 
     def on_button_press(self, ctrl, button_name):
         if not self.paused:
             if button_name == 'rightshoulder':
                 self.rotate_stone()
-                self.rotate_sound_player = self.rotate_sound.play()
+                mixer.play("rotate")
             elif button_name == 'leftshoulder':
-                for i in range(3):
-                    self.rotate_stone()
-                self.rotate_sound_player = self.rotate_sound.play()
+                self.rotate_stone(-1)
+                mixer.play("rotate")
 
         if button_name == 'start':
             self.pause()
 
         # update the position of ghost piece
-        self.ghost_x, self.ghost_y = self.stone_x, self.ghost_piece_position()
+        self.update_ghost()
 
     def on_righttrigger_pressed(self):
         self.store_stone()
@@ -444,34 +312,32 @@ class GameView(ViewWithGamepadSupport):
     def on_dpad_left(self):
         if not self.paused:
             self.move(-1)
-        self.ghost_x, self.ghost_y = self.stone_x, self.ghost_piece_position()
+        self.update_ghost()
 
     def on_leftstick_left(self):
         if not self.paused:
             self.move(-1)
-        self.ghost_x, self.ghost_y = self.stone_x, self.ghost_piece_position()
+        self.update_ghost()
 
     def on_dpad_right(self):
         if not self.paused:
             self.move(1)
-        self.ghost_x, self.ghost_y = self.stone_x, self.ghost_piece_position()
+        self.update_ghost()
 
     def on_leftstick_right(self):
         if not self.paused:
             self.move(1)
-        self.ghost_x, self.ghost_y = self.stone_x, self.ghost_piece_position()
+        self.update_ghost()
 
     def on_dpad_down(self):
         if not self.paused:
             self.drop()
-            self.drop_sound_player = self.drop_sound.play()
-        self.ghost_x, self.ghost_y = self.stone_x, self.ghost_piece_position()
+        self.update_ghost()
 
     def on_leftstick_down(self):
         if not self.paused:
             self.drop()
-            self.drop_sound_player = self.drop_sound.play()
-        self.ghost_x, self.ghost_y = self.stone_x, self.ghost_piece_position()
+        self.update_ghost()
 
     def on_dpad_up(self):
         if not self.paused:
@@ -482,94 +348,44 @@ class GameView(ViewWithGamepadSupport):
             self.hard_drop()
 
 
-    def draw_grid(self, grid, offset_x, offset_y, board_offset_x=0):
-        """
-        Draw the grid. Used to draw the falling stones. The board is drawn
-        by the sprite list.
-        """
-        # Draw the grid
-        for row_idx, row_data in enumerate(grid):
-            for col_idx, cell_value in enumerate(row_data):
-                # Figure out what color to draw the box
-                if cell_value:
-                    color = colors[cell_value]
-                    # Do the math to figure out where the box is
-                    x = (
-                        board_offset_x
-                        + (MARGIN + WIDTH)  # unit width of box
-                        * (col_idx + offset_x)  # box coordinate
-                        + MARGIN
-                        + WIDTH // 2
-                    )
-                    y = (
-                        WINDOW_HEIGHT
-                        - (MARGIN + HEIGHT) * (row_idx + offset_y)
-                        + MARGIN
-                        + HEIGHT // 2
-                    )
-
-                    # Draw the box
-                    arcade.draw_rect_filled(
-                        arcade.rect.XYWH(x, y, WIDTH, HEIGHT), color
-                    )
-
-    def draw_ghost(self):
-        """color the ghost piece where the current stone is predicted to be landing"""
-
-        # Figure out what color to draw the box
-        color = list(colors[max(self.stone[0])])
-        color[3] /= 3
-        color = tuple(color)
-
-        for row_idx, row_data in enumerate(self.stone):
-            for col_idx, cell_value in enumerate(row_data):
-                # Do the math to figure out where the box is
-                x = (self.ghost_x + col_idx) * (MARGIN + WIDTH) + MARGIN + WIDTH // 2
-                y = (
-                    WINDOW_HEIGHT
-                    - (MARGIN + HEIGHT) * (self.ghost_y + row_idx)
-                    + MARGIN
-                    + HEIGHT // 2
-                )
-
-                # Draw the box
-                if cell_value:
-                    arcade.draw_rect_filled(
-                        arcade.rect.XYWH(x, y, WIDTH, HEIGHT), color
-                    )
-
     def update_board(self):
         """
-        Update the sprite list to reflect the contents of the 2d grid
+        Update the sprite lists to reflect the board and the preview boxes,
+        only retexturing the sprites whose cell changed.
         """
-        # update main board sprites
-        for row_idx, row_data in enumerate(self.board):
-            for col_idx, cell_value in enumerate(row_data):
-                i = row_idx * COLUMN_COUNT + col_idx
-                self.board_sprite_list[i].set_texture(cell_value)
+        if self.board_grid is not None:
+            self.board_grid.sync_board(self.engine.board)
+            self.preview_grid.sync(self.board_preview)
+            self.stored_grid.sync(self.board_stored)
+            return
 
-        # update preview board sprites
-        for row_idx, row_data in enumerate(self.board_preview):
-            for col_idx, cell_value in enumerate(row_data):
-                i = row_idx * PREVIEW_COL_COUNT + col_idx
-                self.board_preview_sprite_list[i].set_texture(cell_value)
+        sync_board_sprites(self.board_sprite_list, self.engine.board)
 
+        sync_preview_sprites(self.board_preview_sprite_list, self.shown_preview, self.board_preview)
+        self.shown_preview = self.board_preview
 
-        for row_idx, row_data in enumerate(self.board_stored):
-            for col_idx, cell_value in enumerate(row_data):
-                i = row_idx * PREVIEW_COL_COUNT + col_idx
-                self.board_stored_sprite_list[i].set_texture(cell_value)
+        sync_preview_sprites(self.board_stored_sprite_list, self.shown_stored, self.board_stored)
+        self.shown_stored = self.board_stored
 
     def draw(self):
-        self.board_sprite_list.draw()
-        self.board_preview_sprite_list.draw()
-        self.board_stored_sprite_list.draw()
-        self.draw_grid(self.stone, self.stone_x, self.stone_y)
-        self.draw_ghost()  # This is for the landing prediction
-        self.preview_board_text.draw()
-        self.stored_board_text.draw()
-        self.score_text.draw()
-        self.level_text.draw()
+        if self.board_grid is not None:
+            self.board_grid.draw()
+            self.preview_grid.draw()
+            self.stored_grid.draw()
+        else:
+            self.board_sprite_list.draw()
+            self.board_preview_sprite_list.draw()
+            self.board_stored_sprite_list.draw()
+        engine = self.engine
+        # the stone and the ghost (landing prediction) in one draw call
+        self.piece_sprites.update(engine.stone, engine.stone_x, engine.stone_y, self.ghost_x, self.ghost_y)
+        self.piece_sprites.draw()
+        self.hud.draw()
+        self.static_layer.draw()  # titles and bounding boxes, baked once
+
+    def draw_static(self):
+        """The parts of the screen that never change during a game."""
+        self.hud.draw_static()
 
         # Draw Bounding box for game area
         arcade.draw_rect_outline(
@@ -593,24 +409,18 @@ class GameView(ViewWithGamepadSupport):
         )
 
     def on_draw(self):
-        """Render the screen."""
-
-        # This command has to happen before we start drawing
-        if self.filter_on:
-            self.crt_filter.use()
-            self.crt_filter.clear()
-            self.draw()
-
-            self.window.use()
-            self.clear()
-            self.crt_filter.draw()
-        else:
-            self.clear()
-            self.draw()
+        # every move, rotation, gravity step, lock and hold (and the HUD
+        # update that comes with a lock) bumps the engine version
+        if self.engine.version != self.drawn_version:
+            self.drawn_version = self.engine.version
+            self.scene_changed = True
+        super().on_draw()
 
     def ghost_piece_position(self):
         """Calculate the position of the ghost piece."""
-        ghost_y = self.stone_y
-        while not check_collision(self.board, self.stone, (self.stone_x, ghost_y)):
-            ghost_y += 1
-        return ghost_y
\ No newline at end of file
+        return self.engine.ghost_position()
+
+    def update_ghost(self):
+        """Move the ghost piece under the stone, nothing can move while paused."""
+        if not self.paused:
+            self.ghost_x, self.ghost_y = self.engine.stone_x, self.ghost_piece_position()
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""
+Grid renderer that draws a whole board with a single quad.
+
+The color index of every cell lives in an unsigned integer texture, one byte
+per texel. A fragment shader looks the cell under each pixel up with
+texelFetch, leaves the margins between cells untouched and colors the cell
+from a palette texture built from ``constants.colors``. The CPU only uploads the rows that changed,
+so its cost does not grow with the size of the board.
+
+Used by GameView when RENDER_MODE is "shader", in place of one sprite per cell.
+"""
+from array import array
+
+import arcade
+from arcade.gl import BufferDescription
+
+from constants import *
+
+VERTEX_SHADER = """
+#version 330
+
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+
+in vec2 in_vert;
+in vec2 in_local;
+
+out vec2 v_local;
+
+void main() {
+    gl_Position = window.projection * window.view * vec4(in_vert, 0.0, 1.0);
+    v_local = in_local;
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330
+
+uniform usampler2D cells;  // color index per cell, row 0 is the top row
+uniform sampler2D palette;
+uniform vec2 cell_size;
+uniform vec2 pitch;  // cell size plus margin
+
+in vec2 v_local;  // pixels right of and below the top left corner of the grid
+
+out vec4 fragColor;
+
+void main() {
+    vec2 cell = floor(v_local / pitch);
+    vec2 inside = v_local - cell * pitch;
+    if (inside.x >= cell_size.x || inside.y >= cell_size.y) {
+        discard;  // margin between cells
+    }
+    int index = int(texelFetch(cells, ivec2(cell), 0).r);
+    fragColor = texelFetch(palette, ivec2(index, 0), 0);
+}
+"""
+
+
+class GridRenderer:
+    """
+    A `cols` x `rows` grid of WIDTH x HEIGHT cells, MARGIN apart, whose top
+    left cell is centered on (center_x, center_y) like the sprite it replaces.
+    """
+
+    def __init__(self, cols, rows, center_x, center_y, ctx=None):
+        self.ctx = ctx or arcade.get_window().ctx
+        self.cols = cols
+        self.rows = rows
+        self.cells = bytearray(cols * rows)  # what the texture holds
+        self.board = None  # the board.Board synced last, if any
+
+        self.texture = self.ctx.texture((cols, rows), components=1, dtype="u1")
+        self.texture.filter = self.ctx.NEAREST, self.ctx.NEAREST
+        self.texture.write(self.cells)
+        self.palette = self.ctx.texture(
+            (len(colors), 1), components=4, dtype="f1", data=bytes(c for color in colors for c in color)
+        )
+        self.palette.filter = self.ctx.NEAREST, self.ctx.NEAREST
+
+        left = center_x - WIDTH / 2
+        top = center_y + HEIGHT / 2
+        width = cols * (WIDTH + MARGIN) - MARGIN
+        height = rows * (HEIGHT + MARGIN) - MARGIN
+        vertices = array("f", [
+            left, top, 0.0, 0.0,
+            left, top - height, 0.0, height,
+            left + width, top, width, 0.0,
+            left + width, top - height, width, height,
+        ])
+        self.geometry = self.ctx.geometry(
+            [BufferDescription(self.ctx.buffer(data=vertices), "2f 2f", ["in_vert", "in_local"])],
+            mode=self.ctx.TRIANGLE_STRIP,
+        )
+        self.program = self.ctx.program(vertex_shader=VERTEX_SHADER, fragment_shader=FRAGMENT_SHADER)
+        self.program["cells"] = 0
+        self.program["palette"] = 1
+        self.program["cell_size"] = WIDTH, HEIGHT
+        self.program["pitch"] = WIDTH + MARGIN, HEIGHT + MARGIN
+
+    def write_rows(self, first, last, data):
+        """Upload rows first..last (inclusive) from `data`, a row major buffer of the whole grid."""
+        cols = self.cols
+        chunk = data[first * cols:(last + 1) * cols]
+        self.cells[first * cols:(last + 1) * cols] = chunk
+        self.texture.write(chunk, viewport=(0, first, cols, last + 1 - first))
+
+    def sync_board(self, board):
+        """Upload the rows of a board.Board that changed since the last sync."""
+        rows, dirty_cells = board.take_dirty()
+        if board is not self.board:  # a new game, everything changed
+            self.board = board
+            self.write_rows(0, self.rows - 1, board.cells)
+            return
+
+        cols = self.cols
+        rows = sorted(set(rows).union(i // cols for i in dirty_cells))
+        start = None
+        for i, row in enumerate(rows):  # one upload per run of neighbouring rows
+            if start is None:
+                start = row
+            if i + 1 == len(rows) or rows[i + 1] != row + 1:
+                self.write_rows(start, row, board.cells)
+                start = None
+
+    def sync(self, cells):
+        """Upload a whole grid of color indices (a preview box), if it changed."""
+        if bytes(cells) != self.cells:
+            self.write_rows(0, self.rows - 1, bytes(cells))
+
+    def draw(self):
+        self.texture.use(0)
+        self.palette.use(1)
+        self.geometry.render(self.program)
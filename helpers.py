@@ -1,13 +1,12 @@
 import arcade
-from arcade.clock import GLOBAL_CLOCK
-from arcade.experimental.crt_filter import CRTFilter
-from pyglet.math import Vec2
-import random
-import PIL
 from constants import *
+from blocks import block_colors
+from pieces import rotate_counterclockwise  # kept in pieces, which needs no arcade
 
 def create_textures():
     """Create a list of images for sprites based on the global colors."""
+    import PIL.Image
+
     new_textures = []
     for color in colors:
         image = PIL.Image.new("RGBA", (WIDTH, HEIGHT), color)
@@ -15,15 +14,37 @@ def create_textures():
     return new_textures
 
 
-texture_list = create_textures()
+def __getattr__(name):
+    """Build texture_list on first use instead of at import (the game tints block_sprite()s)."""
+    if name == "texture_list":
+        global texture_list
+        texture_list = create_textures()
+        return texture_list
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def sync_board_sprites(sprite_list, board):
+    """
+    Bring one sprite per cell up to date with a board.Board, recoloring only
+    the sprites of the cells that changed since the last sync.
+    """
+    rows, dirty_cells = board.take_dirty()
+    cells = board.cells
+    cols = board.cols
+    for row in rows:
+        for i in range(row * cols, (row + 1) * cols):
+            sprite_list[i].color = block_colors[cells[i]]
+    for i in dirty_cells:
+        sprite_list[i].color = block_colors[cells[i]]
 
 
-def rotate_counterclockwise(shape):
-    """Rotates a matrix clockwise"""
-    return [
-        [shape[y][x] for y in range(len(shape))]
-        for x in range(len(shape[0]) - 1, -1, -1)
-    ]
+def sync_preview_sprites(sprite_list, shown, preview):
+    """Recolor the sprites of a preview box where `preview` differs from `shown`."""
+    if preview is shown:
+        return
+    for i, (old, new) in enumerate(zip(shown, preview)):
+        if old != new:
+            sprite_list[i].color = block_colors[new]
 
 
 def check_collision(board, shape, offset):
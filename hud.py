@@ -0,0 +1,151 @@
+"""
+Heads-up display of the game view: the box titles, the score and the level.
+
+Laying out text is the expensive part of arcade.Text, so every text object
+here is created once and only gets new contents when the number it shows
+actually changed. With digit glyphs on, the numbers are spelled with sprites
+from ten pre-rendered digit textures instead, and a new score never lays out
+any text at all.
+"""
+import math
+
+import arcade
+
+from constants import *
+
+HUD_X = (MARGIN + WIDTH) * (COLUMN_COUNT + 1)
+FONT_SIZE = 20
+
+
+class DigitStrip:
+    """The digits 0-9 rendered once into textures of the default atlas."""
+
+    def __init__(self, font_size=FONT_SIZE, color=arcade.color.WHITE):
+        atlas = arcade.get_window().ctx.default_atlas
+        self.textures = []
+        self.advances = []  # how far the pen moves after each digit
+        self.descent = 0  # pixels below the baseline in every texture
+
+        for digit in "0123456789":
+            text = arcade.Text(digit, 0, 0, color=color, font_size=font_size)
+            self.descent = -text.bottom
+            size = (math.ceil(text.content_width), math.ceil(text.content_height))
+            text.y = self.descent  # put the glyph box at the texture origin
+            texture = arcade.Texture.create_empty(f"hud-digit-{font_size}-{digit}", size)
+            atlas.add(texture)
+            with atlas.render_into(texture) as fbo:
+                fbo.clear(color=arcade.color.TRANSPARENT_BLACK)
+                text.draw()
+            self.textures.append(texture)
+            self.advances.append(text.content_width)
+
+
+class HudCounter:
+    """
+    A label with a number on the line below it, like "Score: \\n120".
+    The number is only re-laid out (or re-spelled) when it changes.
+    """
+
+    def __init__(self, label, y, value=0, digits=None):
+        self.label = label
+        self.value = value
+        self.digits = digits  # a DigitStrip, or None to lay the number out as text
+
+        if digits is None:
+            self.text = self._make_text(f"{label}\n{value}", y)
+            self.sprites = None
+        else:
+            self.text = self._make_text(label, y)
+            # baseline of the second line, measured once
+            two_lines = self._make_text(f"{label}\n0", y)
+            self.baseline = y - (two_lines.content_height - self.text.content_height)
+            self.sprites = arcade.SpriteList()
+            self._spell(value)
+
+    @staticmethod
+    def _make_text(text, y):
+        return arcade.Text(
+            text,
+            x=HUD_X,
+            y=y,
+            color=arcade.color.WHITE,
+            font_size=FONT_SIZE,
+            anchor_x="left",
+            multiline=True,
+            width=WIDTH * 4
+        )
+
+    def show(self, value):
+        if value == self.value:
+            return
+        self.value = value
+        if self.digits is None:
+            self.text.text = f"{self.label}\n{value}"
+        else:
+            self._spell(value)
+
+    def _spell(self, value):
+        """Point one sprite per digit at its glyph texture, adding sprites as numbers grow."""
+        digits = self.digits
+        number = str(value)
+        while len(self.sprites) < len(number):
+            self.sprites.append(arcade.Sprite(digits.textures[0]))
+
+        pen_x = HUD_X
+        for i, sprite in enumerate(self.sprites):
+            if i >= len(number):
+                sprite.visible = False
+                continue
+            digit = ord(number[i]) - ord("0")
+            sprite.texture = digits.textures[digit]
+            sprite.visible = True
+            sprite.left = pen_x
+            sprite.bottom = self.baseline - digits.descent
+            pen_x += digits.advances[digit]
+
+    def draw(self):
+        self.text.draw()
+        if self.sprites is not None:
+            self.sprites.draw()
+
+
+class Hud:
+    """Everything the game view writes next to the board."""
+
+    def __init__(self, digit_glyphs=HUD_DIGIT_GLYPHS):
+        digits = DigitStrip() if digit_glyphs else None
+
+        self.titles = [
+            arcade.Text(
+                "Next Piece",
+                x=HUD_X,
+                y=WINDOW_HEIGHT - (MARGIN * 2 + HEIGHT),
+                color=arcade.color.WHITE,
+                font_size=FONT_SIZE,
+                anchor_x="left",
+            ),
+            arcade.Text(
+                "Stored Piece",
+                x=HUD_X,
+                y=WINDOW_HEIGHT - (MARGIN + HEIGHT) * 6,
+                color=arcade.color.WHITE,
+                font_size=FONT_SIZE,
+                anchor_x="left",
+            ),
+        ]
+        self.score = HudCounter("Score: ", WINDOW_HEIGHT - (MARGIN + HEIGHT) * 12, 0, digits)
+        self.level = HudCounter("level: ", WINDOW_HEIGHT - (MARGIN + HEIGHT) * 15, 1, digits)
+
+    def update(self, score, level):
+        """Show the given score and level, cheap when neither changed."""
+        self.score.show(score)
+        self.level.show(level)
+
+    def draw_static(self):
+        """The box titles, which never change (see staticLayer.StaticLayer)."""
+        for title in self.titles:
+            title.draw()
+
+    def draw(self):
+        self.score.draw()
+        self.level.draw()
@@ -7,17 +7,29 @@ https://gist.github.com/silvasur/565419/d9de6a84e7da000797ac681976442073045c74a4
 If Python and Arcade are installed, this example can be run from the command line with:
 python -m arcade.examples.tetris
 """
+import startup  # first, so the startup clock covers the imports below
 
 from helpers import *
+from audio import sounds
+from mixer import mixer
 from startMenuView import StartMenuView
 
+startup.timer.mark("imports")
+
 
 def main():
     """Create the game window, setup, run"""
+    # load every sound in the background while the window opens, the menu's first
+    sounds.preload(['sounds/start_menu.mp3', 'sounds/start_game.mp3'])
+    sounds.preload()
     window = arcade.Window(WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_TITLE)
+    startup.timer.mark("window")
     game_view = StartMenuView()
     window.show_view(game_view)
+    startup.timer.mark("start menu")
     arcade.run()
+    sounds.report()
+    mixer.report()
 
 
 if __name__ == "__main__":
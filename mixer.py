@@ -0,0 +1,112 @@
+"""
+Sound effect mixer with a fixed pool of players.
+
+arcade.Sound.play() makes a new pyglet player for every playback, so held or
+repeated input churns player objects and stacks up overlapping copies of the
+same effect. The Mixer plays effects on at most MIXER_VOICES players that are
+reused once their sound ended. Every effect has a voice cap; an effect at its
+cap, or a full pool, takes over the oldest voice (of that effect if it has
+one playing) instead of adding another. Repeats of an effect closer together
+than its coalesce time play once.
+
+Background music keeps its own player, it is not an effect.
+"""
+import time
+
+import pyglet
+
+from constants import *
+
+
+class Effect:
+    """A named sound effect and its playback limits."""
+
+    def __init__(self, sound, voices, coalesce, volume):
+        self.sound = sound
+        self.voices = voices  # most copies playing at once
+        self.coalesce = coalesce  # seconds in which a repeat is dropped
+        self.volume = volume
+        self.last_start = None  # perf_counter() of the last playback
+
+
+class Voice:
+    """One pooled player and the effect it plays."""
+
+    def __init__(self):
+        self.player = pyglet.media.Player()
+        self.effect = None
+        self.started = 0.0
+
+    @property
+    def busy(self):
+        return self.player.source is not None  # pyglet drops the source at its end
+
+
+class Mixer:
+    """Plays registered effects on a fixed pool of reused players."""
+
+    def __init__(self, voices=MIXER_VOICES):
+        self.max_voices = voices
+        self.voices = []  # created on first need, never more than max_voices
+        self.effects = {}  # name -> Effect
+
+        # metrics
+        self.started = 0
+        self.stolen = 0  # playbacks that cut another voice short
+        self.coalesced = 0  # repeats that were dropped
+
+    def add(self, name, sound, voices=2, coalesce=0.05, volume=1.0):
+        """Register `sound` as effect `name`, replacing an effect of that name."""
+        self.effects[name] = Effect(sound, voices, coalesce, volume)
+
+    def play(self, name):
+        """Play effect `name`, within its limits. Returns the voice used, or None."""
+        effect = self.effects[name]
+        now = time.perf_counter()
+        if effect.last_start is not None and now - effect.last_start < effect.coalesce:
+            self.coalesced += 1
+            return None
+
+        voice = self._pick_voice(effect)
+        player = voice.player
+        if voice.busy:
+            self.stolen += 1
+            player.next_source()  # drop what it was playing
+        player.volume = effect.volume
+        player.queue(effect.sound.source)
+        player.play()
+
+        voice.effect = effect
+        voice.started = effect.last_start = now
+        self.started += 1
+        return voice
+
+    def _pick_voice(self, effect):
+        """A free voice, or the oldest one of `effect` at its cap or of all when the pool is full."""
+        playing = [voice for voice in self.voices if voice.busy and voice.effect is effect]
+        if len(playing) >= effect.voices:
+            return min(playing, key=lambda voice: voice.started)
+
+        for voice in self.voices:
+            if not voice.busy:
+                return voice
+        if len(self.voices) < self.max_voices:
+            voice = Voice()
+            self.voices.append(voice)
+            return voice
+        return min(self.voices, key=lambda voice: voice.started)
+
+    def stop(self):
+        """Silence every effect."""
+        for voice in self.voices:
+            if voice.busy:
+                voice.player.next_source()
+
+    def report(self):
+        print(
+            f"[INFO] Mixer: {self.started} effects played on {len(self.voices)} voices, "
+            f"{self.stolen} voices stolen, {self.coalesced} repeats coalesced"
+        )
+
+
+mixer = Mixer()  # shared by all views
@@ -0,0 +1,55 @@
+"""
+Falling stone and ghost drawn as one sprite list.
+
+Every stone has four cells, so four sprites for the stone and four for the
+ghost are made once and only moved or recolored when the stone, its position
+or the ghost position changed. Drawing both is then a single draw call
+without any allocation per frame.
+"""
+import arcade
+
+from constants import *
+from blocks import block_sprite
+
+CELLS = 4  # every tetris stone has four cells
+GHOST_ALPHA = 255 // 3
+
+
+def cell_center(col, row):
+    """Center of the cell at (col, row) in board coordinates, same math as the board sprites."""
+    return (
+        (MARGIN + WIDTH) * col + MARGIN + WIDTH // 2,
+        WINDOW_HEIGHT - (MARGIN + HEIGHT) * row + MARGIN + HEIGHT // 2,
+    )
+
+
+class PieceSprites:
+    """The falling stone and its ghost, repositioned only when they move."""
+
+    def __init__(self):
+        self.sprite_list = arcade.SpriteList()
+        for _ in range(CELLS * 2):  # stone first, ghost drawn on top like before
+            self.sprite_list.append(block_sprite())  # same skin as the board
+        self.stone_sprites = self.sprite_list[:CELLS]
+        self.ghost_sprites = self.sprite_list[CELLS:]
+
+        self.ghost_colors = [(r, g, b, GHOST_ALPHA) for r, g, b, _ in colors]
+        self.shown = None  # (stone, x, y, ghost_x, ghost_y) last laid out
+
+    def update(self, stone, x, y, ghost_x, ghost_y):
+        """Lay the sprites out for `stone` at (x, y) and its ghost at (ghost_x, ghost_y)."""
+        key = (stone, x, y, ghost_x, ghost_y)
+        if key == self.shown:
+            return
+        self.shown = key
+
+        color = colors[stone.piece_id]
+        ghost_color = self.ghost_colors[stone.piece_id]
+        for (col, row), sprite, ghost in zip(stone.cells, self.stone_sprites, self.ghost_sprites):
+            sprite.position = cell_center(x + col, y + row)
+            sprite.color = color
+            ghost.position = cell_center(ghost_x + col, ghost_y + row)
+            ghost.color = ghost_color
+
+    def draw(self):
+        self.sprite_list.draw()
@@ -0,0 +1,79 @@
+"""
+Immutable piece model, built once at import from ``constants.tetris_shapes``.
+
+Every piece gets all four orientations up front, so rotating, holding and
+previewing a piece are index lookups instead of rebuilding nested lists.
+"""
+from collections import namedtuple
+
+from constants import *
+
+# cells are (x, y) offsets from the top left corner, masks are one bitmask per row,
+# bottom is the lowest filled y offset of each column
+Orientation = namedtuple(
+    "Orientation", ["piece_id", "rotation", "cells", "masks", "width", "height", "bottom"]
+)
+# preview is the flat, row major content of the next/stored piece boxes
+Piece = namedtuple("Piece", ["id", "orientations", "preview"])
+
+EMPTY_PREVIEW = (0,) * (PREVIEW_ROW_COUNT * PREVIEW_COL_COUNT)
+
+
+def rotate_counterclockwise(shape):
+    """Rotate a list-of-lists shape counterclockwise (helpers re-exports it)."""
+    return [
+        [shape[y][x] for y in range(len(shape))]
+        for x in range(len(shape[0]) - 1, -1, -1)
+    ]
+
+
+def _make_orientation(piece_id, rotation, shape):
+    cells = tuple(
+        (cx, cy)
+        for cy, row in enumerate(shape)
+        for cx, cell in enumerate(row)
+        if cell
+    )
+    masks = tuple(
+        sum(1 << cx for cx, cell in enumerate(row) if cell) for row in shape
+    )
+    bottom = tuple(
+        max(cy for cy, row in enumerate(shape) if row[cx]) for cx in range(len(shape[0]))
+    )
+    return Orientation(piece_id, rotation, cells, masks, len(shape[0]), len(shape), bottom)
+
+
+def _make_preview(piece_id, shape):
+    """
+    Lay the default orientation out on the preview box the same way
+    join_matrixes does with a (x_offset, 0) offset, which puts the first row
+    of the shape on the bottom line of the box.
+    """
+    preview = [0] * (PREVIEW_ROW_COUNT * PREVIEW_COL_COUNT)
+    x_offset = 1 if len(shape[0]) == 2 else 0  # make the 2x2 stone show in the middle
+    for cy, row in enumerate(shape):
+        preview_row = (cy - 1) % PREVIEW_ROW_COUNT
+        for cx, cell in enumerate(row):
+            if cell:
+                preview[preview_row * PREVIEW_COL_COUNT + cx + x_offset] = piece_id
+    return tuple(preview)
+
+
+def _make_piece(piece_id, shape):
+    preview = _make_preview(piece_id, shape)
+    orientations = []
+    for rotation in range(4):
+        orientations.append(_make_orientation(piece_id, rotation, shape))
+        shape = rotate_counterclockwise(shape)
+    return Piece(piece_id, tuple(orientations), preview)
+
+
+# PIECES[piece_id - 1], in the same order as tetris_shapes
+PIECES = tuple(
+    _make_piece(max(shape[0]), shape) for shape in tetris_shapes
+)
+
+
+def rotated(orientation, turns=1):
+    """Orientation of the same piece after `turns` counterclockwise quarter turns."""
+    return PIECES[orientation.piece_id - 1].orientations[(orientation.rotation + turns) % 4]
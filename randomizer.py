@@ -0,0 +1,44 @@
+"""
+Seeded 7-bag piece generator.
+
+Every bag is a shuffled permutation of all 7 pieces, so a piece shows up at
+most twice in a row, and only across a bag boundary (last of one bag, first
+of the next). The generator has its own
+random.Random, so the same seed always deals the same pieces, which lets
+replays, benchmarks and bots reproduce a game exactly.
+"""
+import itertools
+import random
+from collections import deque
+
+from constants import *
+from pieces import PIECES
+
+
+class BagRandomizer:
+    """Deals pieces from shuffled bags, keeping `lookahead` pieces ready to peek at."""
+
+    def __init__(self, seed=None, lookahead=NEXT_QUEUE_SIZE):
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed  # keep it around so the game can be replayed
+        self.rng = random.Random(seed)
+        self.lookahead = max(lookahead, 1)
+        self.queue = deque()
+        self._fill()
+
+    def _fill(self):
+        while len(self.queue) < self.lookahead:
+            bag = list(PIECES)
+            self.rng.shuffle(bag)
+            self.queue.extend(bag)
+
+    def pop(self):
+        """Take the next piece."""
+        piece = self.queue.popleft()
+        self._fill()
+        return piece
+
+    def peek(self, n=1):
+        """The next `n` pieces (at most `lookahead`), without taking them."""
+        return tuple(itertools.islice(self.queue, min(n, self.lookahead)))
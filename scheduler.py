@@ -0,0 +1,37 @@
+"""
+Fixed-timestep scheduling for game logic.
+
+The window calls on_update once per frame with however much time passed, which
+depends on the monitor and on stalls. FixedTimestep collects that time and
+hands it back in equal ticks, so the game runs at the same speed at 30, 60
+or 144 frames per second.
+"""
+from constants import *
+
+
+class FixedTimestep:
+    """Accumulator turning variable frame times into fixed logic ticks."""
+
+    def __init__(self, rate=LOGIC_TICK_RATE, max_steps=MAX_CATCH_UP_TICKS):
+        self.step = 1 / rate  # seconds per tick
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        # how far we are into the next tick, 0..1, for interpolating drawings
+        self.alpha = 0.0
+
+    def advance(self, delta_time):
+        """Add the time since the last frame, return the number of ticks to run now."""
+        self.accumulator += delta_time
+        steps = int(self.accumulator / self.step + 1e-9)  # don't lose a tick to rounding
+        if steps > self.max_steps:
+            # after a stall, drop the time we would never catch up on
+            steps = self.max_steps
+            self.accumulator = steps * self.step
+        self.accumulator = max(self.accumulator - steps * self.step, 0.0)
+        self.alpha = self.accumulator / self.step
+        return steps
+
+    def reset(self):
+        """Forget the time collected so far, e.g. when resuming from a pause."""
+        self.accumulator = 0.0
+        self.alpha = 0.0
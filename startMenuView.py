@@ -1,29 +1,30 @@
+import time
+
 import arcade
 
 from helpers import *
-from gameView import GameView
-from ViewWithGamepadSupport import ViewWithGamepadSupport
+from audio import sounds
+import crt
+from ViewWithGamepadSupport import ViewWithGamepadSupport, IDLE
 
 class StartMenuView(ViewWithGamepadSupport):
+    activity = IDLE  # only waits for input
+
     def __init__(self):
         super().__init__()
-        # Create the crt filter
-        self.crt_filter = CRTFilter(WINDOW_WIDTH*2, WINDOW_HEIGHT*2,
-                                    resolution_down_scale=1.0,
-                                    hard_scan=-8.0,
-                                    hard_pix=-3.0,
-                                    display_warp=Vec2(1.0 / 32.0, 1.0 / 24.0),
-                                    mask_dark=0.5,
-                                    mask_light=1.5)
-        self.filter_on = CRT_FILTER_ON
-
-        self.bgm = arcade.load_sound('sounds/start_menu.mp3')
+        self.crt_preset = crt.MENU
+
+        self.bgm = sounds.get('sounds/start_menu.mp3')
         self.bgm_player = None
 
-        self.start_sound = arcade.load_sound('sounds/start_game.mp3')
+        self.start_sound = sounds.get('sounds/start_game.mp3')
+
+        self.next_game = None  # the GameView to start, prepared while the menu shows
+        self.prewarm = None  # the steps preparing it that are left, see on_update
 
     def on_show_view(self):
         """ This is run once when we switch to this view """
+        super().on_show_view()
         self.window.background_color = arcade.csscolor.DARK_SLATE_BLUE
 
         self.title_text = arcade.Text(
@@ -43,30 +44,52 @@ class StartMenuView(ViewWithGamepadSupport):
             anchor_x="center",
         )
         self.bgm_player = self.bgm.play()
+        self.prewarm = self.prepare_game()
 
-    def on_draw(self):
-        """ Draw this view """
-        if self.filter_on:
-            self.crt_filter.use()
-            self.crt_filter.clear()
-            self.title_text.draw()
-            self.instruction_text.draw()
+    def prepare_game(self):
+        """
+        Build and set up the next GameView a step at a time. Yields True
+        while its sounds are still loading in the background.
+        """
+        from gameView import GameView, GAME_SOUNDS  # the game and all it needs load here
+
+        sounds.preload(GAME_SOUNDS)
+        yield
+        while not all(sounds.loaded(path) for path in GAME_SOUNDS):
+            yield True
+        self.next_game = GameView()
+        yield
+        yield from self.next_game.setup_steps()
 
-            self.window.use()
-            self.clear()
-            self.crt_filter.draw()
+    def on_update(self, delta_time):
+        """Spend up to PREWARM_SLICE of the idle update on preparing the game."""
+        if self.prewarm is not None:
+            deadline = time.perf_counter() + PREWARM_SLICE
+            for waiting in self.prewarm:
+                if waiting or time.perf_counter() >= deadline:
+                    break
+            else:
+                self.prewarm = None
+        super().on_update(delta_time)
 
-        else:
-            self.clear()
-            self.title_text.draw()
-            self.instruction_text.draw()
+    def draw(self):
+        """ Draw this view """
+        self.title_text.draw()
+        self.instruction_text.draw()
 
     def start_game(self):
+        if self.prewarm is not None:  # started before the game was ready, finish it now
+            if self.next_game is None:  # don't spin on its loading sounds, setup waits for them
+                from gameView import GameView
+
+                self.next_game = GameView()
+                self.prewarm = self.next_game.setup_steps()
+            for _ in self.prewarm:
+                pass
+            self.prewarm = None
         self.bgm_player.pause()
         self.start_sound.play()
-        game_view = GameView()
-        game_view.setup()
-        self.window.show_view(game_view)
+        self.window.show_view(self.next_game)
 
     def on_mouse_press(self, _x, _y, _button, _modifiers):
         """ If the user presses the mouse button, start the game. """
@@ -74,7 +97,6 @@ class StartMenuView(ViewWithGamepadSupport):
 
     def on_button_press(self, ctrl, button_name):
         if button_name == "start":
-            self.on_close()
             self.start_game()
         elif button_name == "back":
             self.window.close()
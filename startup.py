@@ -0,0 +1,45 @@
+"""
+Startup timing, from the first import of main.py to the first drawn frame.
+
+main.py imports this module before anything else and marks the end of every
+startup phase; the base view marks the first frame, which prints the report
+and checks the total against FIRST_FRAME_BUDGET. Only the standard library
+is imported here, so the clock starts before arcade is loaded.
+"""
+import time
+
+FIRST_FRAME_BUDGET = 1.0  # seconds from startup to the first frame
+
+
+class StartupTimer:
+    """Time between named startup phases, reported once at the first frame."""
+
+    def __init__(self, budget=FIRST_FRAME_BUDGET):
+        self.budget = budget
+        self.start = self.last = time.perf_counter()
+        self.phases = []  # (name, seconds) in order
+        self.done = False
+
+    def mark(self, phase):
+        """End `phase`, it took the time since the previous mark."""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def first_frame(self):
+        """Call after every frame; the first call ends startup and reports it."""
+        if self.done:
+            return
+        self.done = True
+        self.mark("first frame")
+        self.report()
+
+    def report(self):
+        total = self.last - self.start
+        verdict = "within" if total <= self.budget else "OVER"
+        print(f"[INFO] Startup: first frame after {total * 1000:.0f} ms, {verdict} the {self.budget * 1000:.0f} ms budget")
+        for phase, seconds in self.phases:
+            print(f"[INFO]   {phase}: {seconds * 1000:.1f} ms")
+
+
+timer = StartupTimer()
@@ -0,0 +1,70 @@
+"""
+Offscreen cache for the parts of a view that almost never change.
+
+A StaticLayer calls its draw function once into a texture the size of the
+render target and from then on composites that texture in a single draw call.
+It bakes again when the target changes size (window resize, CRT filter toggled)
+or after invalidate(), e.g. when the layout changed.
+"""
+import arcade
+from arcade.gl import geometry
+
+VERTEX_SHADER = """
+#version 330
+
+in vec2 in_vert;
+
+void main() {
+    gl_Position = vec4(in_vert, 0.0, 1.0);
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330
+
+uniform sampler2D layer;
+
+out vec4 fragColor;
+
+void main() {
+    vec4 color = texelFetch(layer, ivec2(gl_FragCoord.xy), 0);
+    // pyglet blends text with SRC_ALPHA for the alpha channel too, which
+    // squares the coverage of the baked glyph edges; undo that here
+    fragColor = vec4(color.rgb, sqrt(color.a));
+}
+"""
+
+
+class StaticLayer:
+    """Everything `draw_static` draws, baked once and composited per frame."""
+
+    def __init__(self, draw_static, ctx=None):
+        self.ctx = ctx or arcade.get_window().ctx
+        self.draw_static = draw_static
+        self.framebuffer = None
+        self.quad = geometry.quad_2d_fs()
+        self.program = self.ctx.program(vertex_shader=VERTEX_SHADER, fragment_shader=FRAGMENT_SHADER)
+
+    def invalidate(self):
+        """Bake the layer again on the next draw."""
+        self.framebuffer = None
+
+    def bake(self, size):
+        texture = self.ctx.texture(size, components=4)
+        self.framebuffer = self.ctx.framebuffer(color_attachments=[texture])
+        with self.framebuffer.activate():
+            self.framebuffer.clear()
+            self.draw_static()
+
+    def draw(self):
+        size = self.ctx.active_framebuffer.size
+        if self.framebuffer is None or self.framebuffer.size != size:
+            self.bake(size)
+
+        # the baked colors are premultiplied by their alpha already
+        blend_func = self.ctx.blend_func
+        with self.ctx.enabled(self.ctx.BLEND):
+            self.ctx.blend_func = self.ctx.ONE, self.ctx.ONE_MINUS_SRC_ALPHA
+            self.framebuffer.color_attachments[0].use(0)
+            self.quad.render(self.program)
+        self.ctx.blend_func = blend_func